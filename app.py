@@ -1,116 +1,22 @@
 # app.py — Streamlit CRUD με SQLite (ενημερωμένο με Pepper fields, L1-L27, Loss(h), L3/L8/L24/L25 comments)
-import sqlite3
-from contextlib import closing
-from datetime import date
+import tempfile
+import time
+from datetime import date, timedelta
 import pandas as pd
 import streamlit as st
 
-DB_PATH = "ari_production.db"
-
-# -------------- DB --------------
-def get_conn():
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    conn.execute("PRAGMA journal_mode = WAL;")
-    conn.execute("PRAGMA synchronous = NORMAL;")
-    return conn
-
-def init_db():
-    with closing(get_conn()) as conn, conn, closing(conn.cursor()) as c:
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS production (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            rec_date   TEXT NOT NULL,         -- YYYY-MM-DD
-            line       INTEGER NOT NULL,
-            group_lines INTEGER NOT NULL,
-            code       TEXT NOT NULL,         -- Κωδικός
-            shift_start TEXT NOT NULL,        -- HH:MM
-            shift_end   TEXT NOT NULL,        -- HH:MM
-            filling_ws  INTEGER,              -- Filling WS
-            catering    REAL,                 -- Catering (π.χ. 1.5, 2)
-
-            code_tmx1   REAL DEFAULT 0,
-            code_tmx2   REAL DEFAULT 0,
-            code_tmx3   REAL DEFAULT 0,
-            code_tmx4   REAL DEFAULT 0,
-            code_tmx5   REAL DEFAULT 0,
-            code_tmx6   REAL DEFAULT 0,
-
-            
-            control     INTEGER,              -- Control
-            weighting   REAL,                 -- Weighting
-            packaging   REAL,                 -- Packaging
-            control_in_pack INTEGER,         -- Control in Packaging
-            produced_pcs INTEGER,            -- Produced Pcs
-            reworked_pcs INTEGER,            -- Reworked pcs
-            wrong_weight_reworked INTEGER,   -- Wrong Weight (Reworked Pcs)
-            destroyed   INTEGER,
-
-            -- ΝΕΑ ΠΕΔΙΑ (από screenshots)
-            red_pepper   REAL DEFAULT 0,
-            green_pepper REAL DEFAULT 0,
-            red_cherry_pepper REAL DEFAULT 0,
-            snack_pepper REAL DEFAULT 0,
-            yellow_cherry_pepper REAL DEFAULT 0,
-            jalapeno REAL DEFAULT 0,
-            stuffed_olives REAL DEFAULT 0,
-
-
-            -- L1..L27 (ακέραια)
-            l1  INTEGER DEFAULT 0,  l2  INTEGER DEFAULT 0,  l3  INTEGER DEFAULT 0,
-            l4  INTEGER DEFAULT 0,  l5  INTEGER DEFAULT 0,  l6  INTEGER DEFAULT 0,
-            l7  INTEGER DEFAULT 0,  l8  INTEGER DEFAULT 0,  l9  INTEGER DEFAULT 0,
-            l10 INTEGER DEFAULT 0,  l11 INTEGER DEFAULT 0,  l12 INTEGER DEFAULT 0,
-            l13 INTEGER DEFAULT 0,  l14 INTEGER DEFAULT 0,  l15 INTEGER DEFAULT 0,
-            l16 INTEGER DEFAULT 0,  l17 INTEGER DEFAULT 0,  l18 INTEGER DEFAULT 0,
-            l19 INTEGER DEFAULT 0,  l20 INTEGER DEFAULT 0,  l21 INTEGER DEFAULT 0,
-            l22 INTEGER DEFAULT 0,  l23 INTEGER DEFAULT 0,  l24 INTEGER DEFAULT 0,
-            l25 INTEGER DEFAULT 0,  l26 INTEGER DEFAULT 0,  l27 INTEGER DEFAULT 0,
-
-            -- Comments
-            l3_comment  TEXT,
-            l8_comment  TEXT,
-            l24_comment TEXT,
-            l25_comment TEXT
-
-        );
-        """)
-        c.execute("CREATE INDEX IF NOT EXISTS idx_prod_date ON production(rec_date);")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_prod_line ON production(line);")
-
-def insert_row(**kw):
-    cols = ",".join(kw.keys())
-    placeholders = ",".join(["?"]*len(kw))
-    with closing(get_conn()) as conn, conn, closing(conn.cursor()) as c:
-        c.execute(f"INSERT INTO production ({cols}) VALUES ({placeholders})", tuple(kw.values()))
-
-def update_row(id_, **kw):
-    sets = ",".join([f"{k}=?" for k in kw.keys()])
-    with closing(get_conn()) as conn, conn, closing(conn.cursor()) as c:
-        c.execute(f"UPDATE production SET {sets} WHERE id=?", (*kw.values(), id_))
-
-def delete_row(id_):
-    with closing(get_conn()) as conn, conn, closing(conn.cursor()) as c:
-        c.execute("DELETE FROM production WHERE id=?", (id_,))
-
-def fetch_rows(date_from=None, date_to=None, line=None):
-    q = "SELECT * FROM production WHERE 1=1"
-    p = []
-    if date_from:
-        q += " AND date(rec_date) >= date(?)"; p.append(date_from)
-    if date_to:
-        q += " AND date(rec_date) <= date(?)"; p.append(date_to)
-    if line is not None and str(line).strip() != "":
-        q += " AND line = ?"; p.append(int(line))
-    q += " ORDER BY date(rec_date) DESC, id DESC"
-    with closing(get_conn()) as conn:
-        df = pd.read_sql_query(q, conn, params=p)
-    return df
+from production import (init_db, insert_row, update_row, delete_row, fetch_page, count_rows,
+                        get_row, search_records, export_rows, validate_record, fetch_kpis,
+                        cache_stats, fts_query, search_page, search_count, changed_fields,
+                        ConflictError, COLUMNS, META_COLUMNS, history, record_at, set_terminal,
+                        EXPORT_FORMATS, same_value)
+from production import importer, metrics
 
 # -------------- UI --------------
 import streamlit as st
 
 st.set_page_config(page_title="ARI Production Entry", page_icon="🗂️", layout="wide")
+_rerun_t0 = time.perf_counter()
 
 # --- Header: πάνω εικόνα, από κάτω τίτλος ---
 # (ανέβασε το πλάτος όπως θες: 220, 260, 300...)
@@ -124,11 +30,116 @@ st.markdown("""
 
 # συνέχισε εδώ...
 init_db()
-tab_new, tab_view, tab_edit = st.tabs(["➕ Νέα καταχώριση", "📄 Προβολή & Φίλτρα", "✏️ Επεξεργασία / Διαγραφή"])
+# τερματικό για το ιστορικό αλλαγών: ?terminal=... στο URL του σταθμού, αλλιώς η IP του
+# (το st.context.ip_address δεν υπάρχει σε παλαιότερες εκδόσεις του Streamlit)
+set_terminal(st.query_params.get("terminal")
+             or getattr(getattr(st, "context", None), "ip_address", None))
+tab_new, tab_view, tab_edit, tab_kpi, tab_import, tab_diag = st.tabs(
+    ["➕ Νέα καταχώριση", "📄 Προβολή & Φίλτρα", "✏️ Επεξεργασία / Διαγραφή", "📊 KPI",
+     "📥 Μαζική εισαγωγή", "🩺 Διαγνωστικά"])
+
+PAGE_SIZES = [25, 50, 100, 200]
+PICKER_LIMIT = 200
+
+# Σελιδοποίηση: στο session_state κρατάμε μόνο τη στοίβα των cursors (rec_date, id)
+# για κάθε σελίδα· η βάση επιστρέφει μόνο τις γραμμές της τρέχουσας σελίδας.
+# Με κείμενο αναζήτησης οι σελίδες έρχονται από το ευρετήριο FTS5, κατά συνάφεια.
+def paged_rows(key, date_from=None, date_to=None, line=None, page_size=50, text=None):
+    state = st.session_state.setdefault(key, {"filters": None, "cursors": [None]})
+    filters = (date_from, date_to, line, page_size, text)
+    if state["filters"] != filters:
+        state["filters"], state["cursors"] = filters, [None]
+    if text:
+        df, next_cursor = search_page(text, date_from, date_to, line, page_size, after=state["cursors"][-1])
+    else:
+        df, next_cursor = fetch_page(date_from, date_to, line, page_size, after=state["cursors"][-1])
+    return df, next_cursor, state
+
+def pager_controls(key, state, next_cursor, total, page_size):
+    pages = max(1, -(-total // page_size))
+    n1, n2, n3 = st.columns([1, 2, 1])
+    n1.button("◀ Προηγούμενη", key=f"{key}_prev", use_container_width=True,
+              disabled=len(state["cursors"]) == 1, on_click=lambda: state["cursors"].pop())
+    n2.markdown(f"<div style='text-align:center'>Σελίδα {len(state['cursors'])} από {pages}</div>",
+                unsafe_allow_html=True)
+    n3.button("Επόμενη ▶", key=f"{key}_next", use_container_width=True,
+              disabled=next_cursor is None, on_click=lambda: state["cursors"].append(next_cursor))
+
+# Σύγκρουση στην αποθήκευση: η εγγραφή άλλαξε από άλλο τερματικό μετά τη φόρτωσή της.
+# Δείχνουμε αρχική / δική σου / τρέχουσα τιμή για κάθε πεδίο που άλλαξε από οποιονδήποτε.
+def conflict_view(conflict):
+    base, mine, theirs = conflict["base"], conflict["mine"], conflict["theirs"]
+    st.error("⚠️ Η εγγραφή άλλαξε από άλλο τερματικό όσο την επεξεργαζόσουν — οι αλλαγές σου δεν αποθηκεύτηκαν.")
+    if theirs is None:
+        st.warning("Στο μεταξύ η εγγραφή διαγράφηκε.")
+        if st.button("OK", key="conflict_ok"):
+            st.session_state.pop("edit_conflict", None)
+            st.rerun()
+        return
+    others = changed_fields(base, {c: theirs.get(c) for c in COLUMNS if c not in META_COLUMNS})
+    both = [c for c in mine if c in others and not same_value(mine[c], others[c])]
+    st.dataframe(pd.DataFrame([{"Πεδίο": c, "Αρχική": base.get(c), "Δική σου": mine.get(c, base.get(c)),
+                                "Τρέχουσα": theirs.get(c), "Σύγκρουση": c in both}
+                               for c in COLUMNS if c in mine or c in others]).astype(str),
+                 use_container_width=True, hide_index=True)
+    st.caption(f"Τελευταία αλλαγή: {theirs.get('updated_at') or '—'} (έκδοση {theirs['version']})")
+    if both:
+        st.warning(f"Και τα δύο τερματικά άλλαξαν: {', '.join(both)}.")
+    else:
+        st.info("Οι αλλαγές δεν επικαλύπτονται: η εφαρμογή τους κρατά και τις δύο.")
+    k1, k2 = st.columns(2)
+    if k1.button("💾 Εφαρμογή των αλλαγών μου στην τρέχουσα", use_container_width=True, key="conflict_apply"):
+        try:
+            update_row(conflict["id"], expected_version=theirs["version"], **mine)
+            st.session_state.pop("edit_conflict", None)
+            st.session_state.pop("edit_base", None)
+        except ConflictError as e:
+            st.session_state["edit_conflict"] = dict(conflict, base=theirs, theirs=e.current)
+        st.rerun()
+    if k2.button("↩️ Κράτα την τρέχουσα (απόρριψη των δικών μου)", use_container_width=True, key="conflict_drop"):
+        st.session_state.pop("edit_conflict", None)
+        st.session_state.pop("edit_base", None)
+        st.rerun()
+
+OPS = {"I": "Καταχώριση", "U": "Αλλαγή", "D": "Διαγραφή", "A": "Αρχειοθέτηση"}
+
+def _fmt_change(op, diff):
+    if op == "U":
+        return "; ".join(f"{c}: {old} → {new}" for c, (old, new) in diff.items())
+    if op == "A":
+        return f"αρχείο {diff.get('year')}"
+    return f"{len(diff)} πεδία"
+
+# Ιστορικό από το audit_log και η εγγραφή όπως ήταν σε μια στιγμή (ώρες σε UTC)
+def history_view(rec_id):
+    events = history(rec_id)
+    if not events:
+        st.caption("Δεν υπάρχουν καταγεγραμμένες αλλαγές.")
+        return
+    st.dataframe(pd.DataFrame([{"Ώρα (UTC)": e["ts"], "Τερματικό": e["terminal"], "Ενέργεια": OPS[e["op"]],
+                                "Αλλαγές": _fmt_change(e["op"], e["diff"])} for e in events]),
+                 use_container_width=True, hide_index=True)
+    h1, h2 = st.columns(2)
+    at_day = h1.date_input("Κατάσταση στις (UTC)", value=None, format="DD/MM/YYYY", key=f"hist_day_{rec_id}")
+    at_time = h2.time_input("Ώρα (UTC)", value=None, key=f"hist_time_{rec_id}", step=60)
+    if at_day is None:
+        return
+    ts = f"{at_day.isoformat()} {(at_time.strftime('%H:%M:%S') if at_time else '23:59:59')}.999"
+    then = record_at(rec_id, ts)
+    if then is None:
+        st.info("Η εγγραφή δεν υπήρχε εκείνη τη στιγμή.")
+        return
+    now = get_row(rec_id) or {}
+    diff = [{"Πεδίο": c, "Τότε": then.get(c), "Τώρα": now.get(c)} for c in COLUMNS
+            if c not in META_COLUMNS and not same_value(then.get(c), now.get(c))]
+    if diff:
+        st.dataframe(pd.DataFrame(diff).astype(str), use_container_width=True, hide_index=True)
+    else:
+        st.caption("Ίδια με την τρέχουσα μορφή.")
 
 
 # -------------- Νέα καταχώριση --------------
-with tab_new:
+with tab_new, metrics.timed("render", "new"):
     st.subheader("Καταχώριση")
     with st.form("frm_new", clear_on_submit=True):
         c1, c2, c3, c4 = st.columns(4)
@@ -192,12 +203,7 @@ with tab_new:
 
         submitted = st.form_submit_button("Καταχώριση", use_container_width=True)
         if submitted:
-            errors = []
-            if not str(code).strip(): errors.append("Κωδικός")
-            if not str(group_lines).strip() or not str(group_lines).strip().isdigit():
-                errors.append("group of lines (πρέπει να είναι αριθμός)")
-            for lbl, t in [("Shift Start", shift_start), ("Shift End", shift_end)]:
-                if len(t.strip()) < 4 or ":" not in t: errors.append(lbl)
+            errors = validate_record(code, group_lines, shift_start, shift_end)
             if errors:
                 st.error("Έλεγξε τα πεδία: " + ", ".join(errors))
             else:
@@ -241,36 +247,76 @@ with tab_new:
                 st.success("✅ Η καταχώριση αποθηκεύτηκε.")
 
 # -------------- Προβολή & Φίλτρα --------------
-with tab_view:
+with tab_view, metrics.timed("render", "view"):
     st.subheader("Πίνακας εγγραφών")
-    f1, f2, f3 = st.columns(3)
+    f1, f2, f3, f4 = st.columns([3, 3, 3, 2])
     date_from = f1.date_input("Από", value=None, format="DD/MM/YYYY")
     date_to   = f2.date_input("Έως", value=None, format="DD/MM/YYYY")
     f_line    = f3.number_input("Line (φίλτρο)", min_value=0, step=1, value=0, help="0 = χωρίς φίλτρο")
-    df = fetch_rows(date_from.isoformat() if date_from else None,
-                    date_to.isoformat() if date_to else None,
-                    None if f_line==0 else f_line)
-    st.caption(f"Βρέθηκαν {len(df)} εγγραφές.")
+    page_size = f4.selectbox("Ανά σελίδα", PAGE_SIZES, index=1)
+    flt = (date_from.isoformat() if date_from else None,
+           date_to.isoformat() if date_to else None,
+           None if f_line==0 else f_line)
+    text = st.text_input("🔎 Αναζήτηση κειμένου", placeholder="π.χ. σπασμένο καπάκι  ή  1825",
+                         help="Κωδικός και σχόλια L3/L8/L24/L25· κάθε λέξη ως αρχή λέξης, όλες μαζί. "
+                              "Τα αποτελέσματα ταξινομούνται κατά συνάφεια.")
+    text = text if fts_query(text) else None
+    total = search_count(text, *flt) if text else count_rows(*flt)
+    df, next_cursor, pg = paged_rows("view_pages", *flt, page_size=page_size, text=text)
+    st.caption(f"Βρέθηκαν {total} εγγραφές.")
     st.dataframe(df, use_container_width=True, hide_index=True)
+    pager_controls("view_pages", pg, next_cursor, total, page_size)
 
-    cx1, cx2 = st.columns(2)
+    cx1, cx2, cx3 = st.columns([2, 1, 1])
     if cx1.button("🔄 Ανανέωση", use_container_width=True):
         st.rerun()
-    cx2.download_button("⬇️ Export CSV", data=df.to_csv(index=False).encode("utf-8"),
-                        file_name="production.csv", mime="text/csv", use_container_width=True)
+    exp_fmt = cx2.selectbox("Μορφή export", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f][0],
+                            label_visibility="collapsed")
+    # Το αρχείο φτιάχνεται μόνο όταν ζητηθεί, σε κομμάτια από τη βάση προς ένα προσωρινό αρχείο.
+    if cx3.button("⬇️ Export", use_container_width=True):
+        _, mime, ext = EXPORT_FORMATS[exp_fmt]
+        try:
+            with tempfile.TemporaryFile() as tmp:
+                export_rows(tmp, exp_fmt, *flt)
+                tmp.seek(0)
+                st.download_button(f"💾 Λήψη production.{ext}", data=tmp.read(), file_name=f"production.{ext}",
+                                   mime=mime, use_container_width=True)
+        except (RuntimeError, ValueError) as e:
+            st.error(str(e))
 
 # -------------- Επεξεργασία / Διαγραφή --------------
-with tab_edit:
+with tab_edit, metrics.timed("render", "edit"):
     st.subheader("Επιλογή εγγραφής")
-    df_all = fetch_rows()
-    if df_all.empty:
-        st.info("Δεν υπάρχουν εγγραφές για επεξεργασία.")
+    search = st.text_input("Αναζήτηση", placeholder="π.χ. #152  L3  2024-05  17/05/2024  1825",
+                           help="#id, L<γραμμή>, ημερομηνία (ή YYYY-MM), αρχή κωδικού — συνδυάζονται")
+    labels = search_records(search, limit=PICKER_LIMIT)
+    rec = None
+    if not labels:
+        st.info("Δεν βρέθηκαν εγγραφές για επεξεργασία.")
     else:
-        df_all["label"] = df_all.apply(lambda r: f"#{r['id']} | {r['rec_date']} | L{r['line']} | {r['code']} | pcs={r['produced_pcs']}", axis=1)
-        pick = st.selectbox("Διάλεξε εγγραφή", options=df_all["id"].tolist(),
-                            format_func=lambda _id: df_all.loc[df_all["id"]==_id, "label"].values[0])
-
-        rec = df_all[df_all["id"]==pick].iloc[0].to_dict()
+        if len(labels) == PICKER_LIMIT:
+            st.caption(f"Εμφανίζονται οι {PICKER_LIMIT} πιο πρόσφατες — περιόρισε την αναζήτηση.")
+        pick = st.selectbox("Διάλεξε εγγραφή", options=list(labels), format_func=labels.get)
+        rec = get_row(pick)
+        if rec is None:
+            st.warning("Η εγγραφή δεν υπάρχει πια (διαγράφηκε από άλλο τερματικό).")
+    # Η φόρμα δουλεύει πάνω στην εγγραφή όπως φορτώθηκε (session_state) και όχι όπως είναι
+    # σε κάθε rerun, ώστε η αποθήκευση να ελέγχει την έκδοση που είδε ο χρήστης.
+    if rec is not None:
+        base = st.session_state.get("edit_base")
+        if base is None or base["id"] != rec["id"]:
+            base = st.session_state["edit_base"] = dict(rec)
+        elif base["version"] != rec["version"] and "edit_conflict" not in st.session_state:
+            n1, n2 = st.columns([3, 1])
+            n1.info("Η εγγραφή άλλαξε από άλλο τερματικό μετά τη φόρτωσή της.")
+            if n2.button("🔄 Φόρτωση τρέχουσας", use_container_width=True):
+                st.session_state["edit_base"] = dict(rec)
+                st.rerun()
+        rec = base
+    conflict = st.session_state.get("edit_conflict")
+    if conflict and labels and conflict["id"] == pick:
+        conflict_view(conflict)
+    elif rec is not None:
         eA, eB = st.columns(2)
         mode = eA.radio("Ενέργεια", ["Επεξεργασία", "Διαγραφή"], horizontal=True)
         confirm = eB.toggle("Επιβεβαίωση", value=False)
@@ -348,7 +394,7 @@ with tab_edit:
                             rec_date=rec_date.isoformat(),
                             line=int(line), group_lines=int(group_lines), code=code.strip(),
                             shift_start=shift_start.strip(), shift_end=shift_end.strip(),
-                            filling_ws=int(filling_ws), catering=float(catering),
+                            filling_ws=int(filling_ws), catering=float(catering), control=int(control),
                             code_tmx1=code_tmx1.strip() or None, code_tmx2=code_tmx2.strip() or None,
                             code_tmx3=code_tmx3.strip() or None, code_tmx4=code_tmx4.strip() or None,
                             code_tmx5=code_tmx5.strip() or None, code_tmx6=code_tmx6.strip() or None,
@@ -366,12 +412,131 @@ with tab_edit:
                             l25_comment=l25_comment.strip() or None
                         )
                         payload.update({k:int(v) for k,v in L_vals.items()})
-                        update_row(int(rec["id"]), **payload)
-                        st.success("✅ Η εγγραφή ενημερώθηκε.")
-                        st.rerun()
+                        # μόνο τα πεδία που άλλαξαν, και μόνο αν κανείς άλλος δεν άλλαξε την εγγραφή
+                        diff = changed_fields(rec, payload)
+                        if not diff:
+                            st.info("Δεν υπάρχουν αλλαγές.")
+                        else:
+                            try:
+                                update_row(int(rec["id"]), expected_version=rec["version"], **diff)
+                                st.session_state.pop("edit_base", None)
+                                st.success("✅ Η εγγραφή ενημερώθηκε.")
+                            except ConflictError as e:
+                                st.session_state["edit_conflict"] = {"id": int(rec["id"]), "base": dict(rec),
+                                                                     "mine": diff, "theirs": e.current}
+                            st.rerun()
         else:
             st.warning("Προσοχή: Η διαγραφή είναι οριστική.")
             if st.button("🗑️ Διαγραφή", type="primary", disabled=not confirm, use_container_width=True):
-                delete_row(int(rec["id"]))
-                st.success("🗑️ Η εγγραφή διαγράφηκε.")
-                st.rerun()
+                try:
+                    delete_row(int(rec["id"]), expected_version=rec["version"])
+                    st.success("🗑️ Η εγγραφή διαγράφηκε.")
+                    st.rerun()
+                except ConflictError:
+                    st.error("Η εγγραφή άλλαξε από άλλο τερματικό — έλεγξε την τρέχουσα μορφή της πριν τη διαγραφή.")
+
+        with st.expander("🕘 Ιστορικό αλλαγών"):
+            history_view(int(rec["id"]))
+
+# -------------- KPI --------------
+# Διαβάζει μόνο τον daily_summary (μία γραμμή ανά ημέρα × γραμμή × κωδικό).
+with tab_kpi, metrics.timed("render", "kpi"):
+    st.subheader("Δείκτες παραγωγής")
+    k1, k2, k3 = st.columns(3)
+    k_from = k1.date_input("Από", value=date.today() - timedelta(days=30), format="DD/MM/YYYY", key="kpi_from")
+    k_to   = k2.date_input("Έως", value=date.today(), format="DD/MM/YYYY", key="kpi_to")
+    k_line = k3.number_input("Line (φίλτρο)", min_value=0, step=1, value=0, help="0 = όλες", key="kpi_line")
+    kflt = (k_from.isoformat() if k_from else None, k_to.isoformat() if k_to else None,
+            None if k_line==0 else k_line)
+
+    tot = fetch_kpis(*kflt, by=())
+    if tot.empty or not tot["n_records"].fillna(0).iloc[0]:
+        st.info("Δεν υπάρχουν εγγραφές στο διάστημα.")
+    else:
+        t = tot.iloc[0]
+        produced = int(t["produced_pcs"])
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Βάρδιες", int(t["n_records"]))
+        m2.metric("Produced Pcs", f"{produced:,}")
+        m3.metric("Reworked pcs", f"{int(t['reworked_pcs']):,}",
+                  f"{100 * t['reworked_pcs'] / produced:.1f}%" if produced else None, delta_color="off")
+        m4.metric("Destroyed", f"{int(t['destroyed']):,}",
+                  f"{100 * t['destroyed'] / produced:.1f}%" if produced else None, delta_color="off")
+
+        daily = fetch_kpis(*kflt, by=("rec_date",)).set_index("rec_date")
+        st.markdown("**Παραγωγή ανά ημέρα**")
+        st.bar_chart(daily[["produced_pcs", "reworked_pcs", "wrong_weight_reworked", "destroyed"]])
+
+        st.markdown("**Errors L1 – L27**")
+        errs = t[[f"l{i}" for i in range(1, 28)]].astype(int)
+        errs.index = [f"L{i}" for i in range(1, 28)]
+        st.bar_chart(errs.rename("σύνολο"))
+
+        st.markdown("**Products ανά ημέρα**")
+        st.line_chart(daily[["red_pepper", "green_pepper", "red_cherry_pepper", "snack_pepper",
+                             "yellow_cherry_pepper", "jalapeno", "stuffed_olives"]])
+
+        st.markdown("**Ανά γραμμή και κωδικό**")
+        st.dataframe(fetch_kpis(*kflt, by=("line", "code")), use_container_width=True, hide_index=True)
+
+# -------------- Μαζική εισαγωγή --------------
+with tab_import, metrics.timed("render", "import"):
+    st.subheader("Μαζική εισαγωγή από CSV / Excel")
+    st.caption("Επικεφαλίδες όπως στη φόρμα (Date, Line, group of lines, Κωδικός, Shift Start, …) "
+               "ή με τα ονόματα των στηλών της βάσης. Ημερομηνία ως YYYY-MM-DD ή DD/MM/YYYY.")
+    up = st.file_uploader("Αρχείο", type=["csv", "xlsx", "xls"])
+    iA, iB = st.columns(2)
+    upsert = iA.toggle("Ενημέρωση υπαρχουσών (ίδια ημερομηνία, γραμμή, βάρδια, κωδικός)", value=True)
+    dry_run = iB.toggle("Μόνο έλεγχος (χωρίς αποθήκευση)", value=False)
+    if st.button("📥 Εισαγωγή", disabled=up is None, use_container_width=True):
+        with st.spinner("Εισαγωγή..."):
+            res = importer.import_file(up, name=up.name, upsert=upsert, dry_run=dry_run)
+        st.success(f"Έγκυρες: {res['valid']} · Νέες: {res['inserted']} · Ενημερώθηκαν: {res['updated']} · "
+                   f"Χωρίς αλλαγή: {res['unchanged']} · Απορρίφθηκαν: {res['rejected']} · Διπλές: {res['duplicates']} · "
+                   f"Απέτυχαν: {res['failed']}")
+        if res["ignored_columns"]:
+            st.warning("Αγνοήθηκαν στήλες που δεν αντιστοιχούν σε πεδίο: " + ", ".join(res["ignored_columns"]))
+        if len(res["errors"]):
+            st.dataframe(res["errors"], use_container_width=True, hide_index=True)
+            st.download_button("⬇️ Αναφορά σφαλμάτων", data=res["errors"].to_csv(index=False).encode("utf-8"),
+                               file_name="import_errors.csv", mime="text/csv")
+
+# -------------- Διαγνωστικά --------------
+# Χρόνοι ανά βήμα (σύνδεση, SQLite, pandas, cache, render καρτέλας) για αυτό το process.
+# Το "render" μετράει την εκτέλεση του κώδικα της καρτέλας στον server, όχι τον browser.
+with tab_diag:
+    st.subheader("Διαγνωστικά απόδοσης")
+    d1, d2, d3, d4 = st.columns(4)
+    cs = cache_stats()
+    d1.metric("Cache εγγραφές", cs["entries"])
+    d2.metric("Cache MB", f"{cs['bytes'] / 1e6:.1f}")
+    metrics.SLOW_QUERY_MS = d3.number_input("Όριο αργού query (ms)", min_value=1.0, step=50.0,
+                                            value=float(metrics.SLOW_QUERY_MS))
+    if d4.button("🧹 Μηδενισμός μετρήσεων", use_container_width=True):
+        metrics.reset()
+        st.rerun()
+
+    snap = metrics.snapshot()
+    if snap:
+        st.dataframe(pd.DataFrame(snap), use_container_width=True, hide_index=True)
+    else:
+        st.info("Δεν υπάρχουν ακόμη μετρήσεις.")
+
+    slow = metrics.slow_queries()
+    st.markdown(f"**Αργά queries** (≥ {metrics.SLOW_QUERY_MS:.0f} ms): {len(slow)}")
+    for q in slow[:20]:
+        with st.expander(f"{q['name']} · {q['ms']:.1f} ms · {q['rows']} γραμμές"):
+            st.code(q["sql"], language="sql")
+            st.caption(f"params: {q['params']}")
+            st.code("\n".join(q["plan"]), language="text")
+
+    e1, e2 = st.columns(2)
+    e1.download_button("⬇️ Μετρήσεις (JSON lines)", data="\n".join(metrics.jsonl_lines()) + "\n",
+                       file_name="ari_metrics.jsonl", mime="application/x-ndjson", use_container_width=True)
+    e2.download_button("⬇️ Μετρήσεις (Prometheus)", data=metrics.prometheus_text(),
+                       file_name="ari_metrics.prom", mime="text/plain", use_container_width=True)
+    if metrics.METRICS_FILE:
+        st.caption(f"Αυτόματο export κάθε {metrics.METRICS_FLUSH_S}s στο {metrics.METRICS_FILE}")
+
+metrics.record("render", "rerun", time.perf_counter() - _rerun_t0)
+metrics.maybe_export()
@@ -0,0 +1,183 @@
+# benchmarks/bench.py — Μετρήσεις χρόνου/μνήμης των πραγματικών διαδρομών κώδικα
+#
+#   python benchmarks/bench.py --rows 1000000               # φτιάχνει (μία φορά) και μετράει
+#   python benchmarks/bench.py --db bench.db --json out.json
+#
+# Κάθε μέτρηση τρέχει --repeat φορές με το cache αναγνώσεων απενεργοποιημένο (εκτός
+# με --cache) και αναφέρει p50/p95/p99/max σε ms, μαζί με την κορυφή μνήμης Python
+# (tracemalloc, σε ξεχωριστό πέρασμα ώστε να μην αλλοιώνει τους χρόνους).
+# Οι μετρήσεις εγγραφών τρέχουν σε προσωρινό αντίγραφο, ώστε η βάση που ξαναχρησιμοποιείται
+# να έχει πάντα μόνο τα συνθετικά δεδομένα.
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import production
+from production import cache, connection, synthetic
+
+def pct(values, p):
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+def summarize(name, lat_s, peak_bytes=None, n=None):
+    ms = [x * 1000 for x in lat_s]
+    return {"name": name, "n": n or len(ms), "p50_ms": pct(ms, 50), "p95_ms": pct(ms, 95),
+            "p99_ms": pct(ms, 99), "max_ms": max(ms), "mean_ms": statistics.fmean(ms),
+            "peak_mem_mb": None if peak_bytes is None else peak_bytes / 2**20}
+
+def measure(name, fn, repeat):
+    fn()                                    # ζέσταμα (pool, page cache)
+    lat = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        lat.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summarize(name, lat, peak)
+
+# -------------- εγγραφές από πολλά processes --------------
+def _writer_proc(db_path, n, seed, update_ids):
+    production.set_db_path(db_path)
+    rows = [dict(zip(synthetic.INSERT_COLS, r))
+            for r in synthetic.synthetic_rows(n, seed=seed)]
+    lat = []
+    for i, rec in enumerate(rows):
+        t0 = time.perf_counter()
+        if update_ids:
+            production.update_row(update_ids[i % len(update_ids)], produced_pcs=rec["produced_pcs"], l3=rec["l3"])
+        else:
+            production.insert_row(**rec)
+        lat.append(time.perf_counter() - t0)
+    return lat
+
+def concurrent_writes(db_path, writers, per_writer, update_ids=None):
+    name = f"{'update' if update_ids else 'insert'} x{writers} processes"
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(writers) as ex:
+        futs = [ex.submit(_writer_proc, db_path, per_writer, 1000 + i, update_ids) for i in range(writers)]
+        lat = [x for f in futs for x in f.result()]
+    res = summarize(name, lat)
+    res["throughput_per_s"] = len(lat) / (time.perf_counter() - t0)
+    return res
+
+def threaded_reads_during_writes(writers, per_writer, date_from, date_to):
+    # αναγνώσεις σελίδων όσο τρέχουν εγγραφές από threads (ίδιο process, όπως στο Streamlit)
+    def write_loop(seed):
+        rows = synthetic.synthetic_rows(per_writer, seed=seed)
+        for r in rows:
+            production.insert_row(**dict(zip(synthetic.INSERT_COLS, r)))
+    threads = [threading.Thread(target=write_loop, args=(2000 + i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    lat = []
+    while any(t.is_alive() for t in threads):
+        t0 = time.perf_counter()
+        production.fetch_page(date_from, date_to, page_size=50)
+        lat.append(time.perf_counter() - t0)
+    for t in threads:
+        t.join()
+    return summarize(f"fetch_page during {writers} writer threads", lat)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks της βάσης παραγωγής")
+    ap.add_argument("--db", default="bench_production.db")
+    ap.add_argument("--rows", type=int, default=200_000, help="μέγεθος συνθετικής βάσης")
+    ap.add_argument("--lines", type=int, default=12)
+    ap.add_argument("--codes", type=int, default=400)
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--writers", type=int, default=4)
+    ap.add_argument("--writes", type=int, default=200, help="εγγραφές ανά writer")
+    ap.add_argument("--cache", action="store_true", help="μέτρηση με ενεργό το cache αναγνώσεων")
+    ap.add_argument("--json", help="αποθήκευση αποτελεσμάτων σε JSON")
+    args = ap.parse_args(argv)
+
+    production.set_db_path(args.db)
+    production.init_db()
+    have = production.count_rows()
+    if have < args.rows:
+        t0 = time.perf_counter()
+        print(f"δημιουργία {args.rows - have} συνθετικών γραμμών στο {args.db} ...", file=sys.stderr)
+        synthetic.generate(args.rows - have, lines=args.lines, codes=args.codes, seed=have,
+                           progress=lambda d: print(f"  {d}", end="\r", file=sys.stderr))
+        print(f"  έτοιμο σε {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+        with connection.write_conn() as conn:
+            conn.execute("ANALYZE;")
+    if not args.cache:
+        cache.CACHE_MAX_ENTRIES = 0
+
+    # διαστήματα από το εύρος των συνθετικών δεδομένων (synthetic_span), όχι από το
+    # MAX(rec_date): η βάση μπορεί να έχει γραμμές από παλαιότερες εκδόσεις του benchmark
+    lo, hi = (d.isoformat() for d in synthetic.synthetic_span())
+    with connection.read_conn() as conn:
+        code = conn.execute("SELECT code FROM production ORDER BY rowid DESC LIMIT 1").fetchone()[0]
+        mid_id = conn.execute("SELECT id FROM production ORDER BY id DESC LIMIT 1 OFFSET 1000").fetchone()[0]
+    last_year = str(int(hi[:4]) - 1)
+    month = hi[:7]
+    y_from, y_to = f"{last_year}-01-01", f"{last_year}-12-31"
+    m_from, m_to = f"{month}-01", f"{month}-31"
+
+    total = production.count_rows()
+    results = []
+    r = args.repeat
+    print(f"βάση: {args.db}  γραμμές: {total}  διάστημα: {lo} … {hi}", file=sys.stderr)
+
+    results.append(measure("fetch_rows month", lambda: production.fetch_rows(m_from, m_to), r))
+    results.append(measure("fetch_rows month+line", lambda: production.fetch_rows(m_from, m_to, 3), r))
+    results.append(measure("fetch_rows year+line", lambda: production.fetch_rows(y_from, y_to, 3), max(3, r // 5)))
+    results.append(measure("fetch_page first (no filter)", lambda: production.fetch_page(page_size=50), r))
+    deep = (y_from, 1)                      # cursor στην αρχή του προηγούμενου έτους
+    results.append(measure("fetch_page deep cursor", lambda: production.fetch_page(page_size=50, after=deep), r))
+    results.append(measure("count_rows year", lambda: production.count_rows(y_from, y_to), r))
+    results.append(measure("picker: latest", lambda: production.search_records("", 200), r))
+    results.append(measure("picker: code prefix", lambda: production.search_records(code[:4], 200), r))
+    results.append(measure("picker: line + month", lambda: production.search_records(f"L3 {month}", 200), r))
+    results.append(measure("get_row", lambda: production.get_row(mid_id), r))
+    results.append(measure("kpi by day (year)", lambda: production.fetch_kpis(y_from, y_to, by=("rec_date",)), r))
+
+    with open(os.devnull, "wb") as sink:
+        results.append(measure("export csv year", lambda: production.export_rows(sink, "csv", y_from, y_to),
+                               max(3, r // 10)))
+
+    # εγγραφές σε αντίγραφο (VACUUM INTO), που σβήνεται στο τέλος
+    tmp = tempfile.mkdtemp(prefix="ari_bench_")
+    try:
+        copy = os.path.join(tmp, os.path.basename(args.db))
+        with connection.read_conn() as conn:
+            conn.execute("VACUUM INTO ?;", (copy,))
+        production.set_db_path(copy)    # κλείνει και τις συνδέσεις· οι writers είναι άλλα processes
+        results.append(concurrent_writes(copy, args.writers, args.writes))
+        ids = list(range(mid_id, mid_id + 500))
+        results.append(concurrent_writes(copy, args.writers, args.writes, update_ids=ids))
+        production.init_db()
+        results.append(threaded_reads_during_writes(args.writers, args.writes, m_from, m_to))
+    finally:
+        production.close_all()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # Linux: KB
+    print(f"\n{'benchmark':38} {'n':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'peak MB':>8}")
+    for x in results:
+        peak = "" if x["peak_mem_mb"] is None else f"{x['peak_mem_mb']:.1f}"
+        print(f"{x['name']:38} {x['n']:>5} {x['p50_ms']:>9.2f} {x['p95_ms']:>9.2f} "
+              f"{x['p99_ms']:>9.2f} {x['max_ms']:>9.2f} {peak:>8}")
+    print(f"\nmax RSS: {rss:.0f} MB")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"db": args.db, "rows": total, "max_rss_mb": rss, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# manage.py — Συντόμευση για το `python -m production` (βλ. production/cli.py)
+import sys
+
+from production.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
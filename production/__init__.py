@@ -0,0 +1,19 @@
+# production — Headless πυρήνας δεδομένων της ARI Production (χωρίς Streamlit)
+#
+# Μπορεί να φορτωθεί από το app.py, από cron jobs ή από τη γραμμή εντολών
+# (python -m production ...). Το pandas φορτώνεται μόνο όταν ζητηθεί DataFrame,
+# και ο importer (pandas/Excel) μόνο με `from production import importer`.
+from .archive import archive_status, archive_year, backup
+from .audit import audit_range, history, record_at, set_terminal
+from .cache import cache_stats, cached, invalidate_cache
+from .connection import close_all, get_conn, read_conn, set_db_path, write_conn
+from .crud import (ConflictError, changed_fields, delete_row, insert_record, insert_row, same_value,
+                   update_row)
+from .export import EXPORT_FORMATS, export_rows, iter_chunks
+from .fts import fts_query, rebuild_fts, search_count, search_page
+from .models import COLUMNS, META_COLUMNS, ProductionRecord, validate_record
+from .plans import check_query_plans
+from .queries import (count_rows, fetch_page, fetch_rows, get_record, get_row, query_plan,
+                      search_records)
+from .schema import init_db
+from .summary import fetch_kpis, rebuild_summary
@@ -0,0 +1,268 @@
+# production/archive.py — Αρχειοθέτηση κλειστών ετών σε ξεχωριστά αρχεία SQLite
+#
+# Κάθε κλειστό έτος μεταφέρεται από τον πίνακα production της ζωντανής βάσης σε δικό
+# του αρχείο (<βάση>_archive_<έτος>.db, δίπλα στη βάση ή στο $ARI_ARCHIVE_DIR), με τον
+# ίδιο πίνακα production και τα indexes ημερομηνίας/γραμμής. Το archive_parts της
+# ζωντανής βάσης λέει ποια έτη έχουν αρχείο και έως ποια ημερομηνία (through) ισχύει.
+#
+# Η μεταφορά γίνεται ανά μήνα, σε δύο βήματα, γιατί το commit σε δύο αρχεία δεν είναι
+# ατομικό:
+#   1. αντιγραφή του μήνα σε προσωρινό πίνακα της σύνδεσης του αρχείου (η ζωντανή βάση
+#      είναι attached, μόνο για ανάγνωση — δεν κρατά το write lock)
+#   2. σε μία σύντομη συναλλαγή του writer: έλεγχος ότι καμία γραμμή του μήνα δεν άλλαξε
+#      στο μεταξύ (id + version), εγγραφή στο αρχείο, διαγραφή από τη ζωντανή βάση και
+#      ενημέρωση του through. Αν κάτι άλλαξε, το βήμα 1 ξαναγίνεται.
+# Κατά τη διαγραφή το archive_moving έχει μία γραμμή: το daily_summary κρατά τα σύνολα
+# (τα KPI καλύπτουν και τα αρχειοθετημένα έτη) και το audit_log γράφει γεγονός "A".
+#
+# Οι αναγνώσεις (fetch_rows, fetch_page, count_rows, export) περνούν από το sources():
+# πρώτα η ζωντανή βάση, μετά όσα αρχεία επικαλύπτουν το διάστημα, το καθένα μόνο έως το
+# through του (ό,τι γράφτηκε στο αρχείο πριν τη διαγραφή από τη ζωντανή βάση δεν
+# διαβάζεται δύο φορές). Η αναζήτηση κειμένου, ο picker και η επεξεργασία αφορούν μόνο
+# τη ζωντανή βάση.
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+from datetime import date
+
+from . import connection, metrics
+from .connection import get_conn, get_ro_conn, read_conn, read_only_conn, write_conn
+from .queries import _iso_date
+
+ARCHIVE_DIR = os.environ.get("ARI_ARCHIVE_DIR")
+ARCHIVE_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_prod_date ON production(rec_date);
+CREATE INDEX IF NOT EXISTS idx_prod_line_date ON production(line, rec_date);
+"""
+# συνθήκη των triggers διαγραφής (σύνοψη/audit) κατά τη μεταφορά
+ARCHIVE_GUARD = "NOT EXISTS (SELECT 1 FROM archive_moving)"
+MOVE_RETRIES = 5
+
+# conn: ανοιχτή σύνδεση· select: λίστα στηλών (NULL για όσες λείπουν από παλαιότερο
+# αρχείο)· clamp/params: επιπλέον φίλτρο μετά το WHERE του query
+Source = namedtuple("Source", "name conn select clamp params")
+
+def archive_ddl():
+    return """
+    CREATE TABLE IF NOT EXISTS archive_parts (
+        year        INTEGER PRIMARY KEY,
+        path        TEXT NOT NULL,          -- όνομα αρχείου, σχετικό με τον φάκελο αρχείων
+        through     TEXT NOT NULL,          -- YYYY-MM-DD: έως εδώ διαβάζεται το αρχείο
+        rows        INTEGER NOT NULL DEFAULT 0,
+        archived_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS archive_moving (x INTEGER);
+    """
+
+class _Stale(Exception):
+    pass
+
+def archive_dir():
+    return ARCHIVE_DIR or os.path.dirname(os.path.abspath(connection.DB_PATH))
+
+def archive_name(year):
+    stem = os.path.splitext(os.path.basename(connection.DB_PATH))[0]
+    return f"{stem}_archive_{int(year)}.db"
+
+def archive_path(name):
+    return os.path.join(archive_dir(), name)
+
+def _parts(conn, where="", params=()):
+    try:
+        return conn.execute("SELECT year, path, through, rows, archived_at FROM archive_parts"
+                            + where + " ORDER BY year DESC", params).fetchall()
+    except sqlite3.OperationalError:        # πριν τη migration του archive_parts
+        return []
+
+def _part_conn(name):
+    # σύνδεση μόνο για ανάγνωση από το pool του αρχείου (connection.read_only_conn)
+    path = archive_path(name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Λείπει το αρχείο αρχειοθέτησης {path}")
+    return read_only_conn(path)
+
+def _columns(conn, schema="main"):
+    return [r[1] for r in conn.execute(f"PRAGMA {schema}.table_info(production);")]
+
+# -------------- Ανάγνωση --------------
+@contextmanager
+def sources(date_from=None, date_to=None):
+    # Η ζωντανή βάση διαβάζεται σε μία συναλλαγή, ώστε archive_parts και δεδομένα να
+    # είναι από το ίδιο snapshot.
+    date_from = _iso_date(date_from) if date_from else None
+    date_to = _iso_date(date_to) if date_to else None
+    with ExitStack() as stack:
+        live = stack.enter_context(read_conn())
+        live.execute("BEGIN;")
+        q, p = " WHERE through >= ?", [date_from or ""]
+        if date_to:
+            q += " AND year <= ?"; p.append(int(date_to[:4]))
+        parts = _parts(live, q, p)
+        cols = _columns(live)
+        srcs = [Source("live", live, ", ".join(cols), "", [])]
+        for year, name, through, _rows, _at in parts:
+            conn = stack.enter_context(_part_conn(name))
+            have = set(_columns(conn))
+            select = ", ".join(c if c in have else f"NULL AS {c}" for c in cols)
+            srcs.append(Source(str(year), conn, select, " AND rec_date <= ?", [through]))
+        yield srcs
+
+def archived_row(rec_id, year):
+    with read_conn() as live:
+        part = _parts(live, " WHERE year = ?", (int(year),))
+    if not part:
+        return None
+    with _part_conn(part[0][1]) as conn:
+        cur = conn.execute("SELECT * FROM production WHERE id = ?", (int(rec_id),))
+        row = cur.fetchone()
+        return None if row is None else dict(zip([d[0] for d in cur.description], row))
+
+def archived_summary():
+    # γραμμές σύνοψης των αρχείων, για το ξαναχτίσιμο του daily_summary
+    from .summary import summary_select_sql
+    with read_conn() as live:
+        parts = _parts(live)
+    rows = []
+    for _year, name, through, _rows, _at in parts:
+        with _part_conn(name) as conn:
+            rows += conn.execute(summary_select_sql(" WHERE rec_date <= ?"), (through,)).fetchall()
+    return rows
+
+def archive_status():
+    # ανά έτος: πόσες εγγραφές είναι ακόμα στη ζωντανή βάση και πόσες στο αρχείο
+    with read_conn() as live:
+        years = dict(live.execute("SELECT CAST(substr(rec_date, 1, 4) AS INTEGER), COUNT(*)"
+                                  " FROM production GROUP BY 1;").fetchall())
+        parts = {r[0]: r for r in _parts(live)}
+    out = []
+    for y in sorted(set(years) | set(parts)):
+        _y, name, through, rows, at = parts.get(y, (y, None, None, 0, None))
+        path = archive_path(name) if name else None
+        out.append({"year": y, "live_rows": years.get(y, 0), "archived_rows": rows,
+                    "through": through, "archived_at": at, "path": path,
+                    "bytes": os.path.getsize(path) if path and os.path.exists(path) else None})
+    return out
+
+# -------------- Μεταφορά --------------
+def _open_archive(path):
+    # Ο πίνακας φτιάχνεται από το CREATE TABLE της ζωντανής βάσης· στήλες που προστέθηκαν
+    # αργότερα με migration προστίθενται και εδώ. Από τη ζωντανή βάση (live) μόνο διαβάζουμε.
+    conn = get_conn(path)
+    conn.execute("ATTACH DATABASE ? AS live;", (os.path.abspath(connection.DB_PATH),))
+    sql = conn.execute("SELECT sql FROM live.sqlite_master WHERE type = 'table' AND name = 'production';").fetchone()[0]
+    conn.execute(sql.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+    have = set(_columns(conn))
+    for _cid, name, type_, notnull, default, _pk in conn.execute("PRAGMA live.table_info(production);").fetchall():
+        if name not in have:
+            conn.execute(f"ALTER TABLE main.production ADD COLUMN {name} {type_}"
+                         + (" NOT NULL" if notnull else "")
+                         + (f" DEFAULT {default}" if default is not None else ""))
+    for stmt in ARCHIVE_INDEXES.strip().splitlines():
+        conn.execute(stmt)
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS staging AS SELECT * FROM main.production WHERE 0;")
+    return conn
+
+def _copy_month(arch, cols, lo, hi):
+    # βήμα 1: στιγμιότυπο του μήνα από τη ζωντανή βάση (χωρίς write lock εκεί)
+    names = ", ".join(cols)
+    arch.execute("BEGIN;")
+    arch.execute("DELETE FROM temp.staging;")
+    arch.execute(f"INSERT INTO temp.staging ({names}) SELECT {names} FROM live.production"
+                 " WHERE rec_date >= ? AND rec_date < ?;", (lo, hi))
+    arch.execute("COMMIT;")
+    return dict(arch.execute("SELECT id, version FROM temp.staging;").fetchall())
+
+def _move_month(arch, cols, year, name, lo, hi, last_day, staged):
+    # βήμα 2: μία συναλλαγή του writer· _Stale αν ο μήνας άλλαξε μετά την αντιγραφή
+    names = ", ".join(cols)
+    with write_conn() as conn:
+        now = dict(conn.execute("SELECT id, version FROM production WHERE rec_date >= ? AND rec_date < ?;",
+                                (lo, hi)).fetchall())
+        if any(staged.get(i) != v for i, v in now.items()):
+            raise _Stale()
+        if not now:
+            return 0
+        # όσα διαγράφηκαν ή άλλαξαν μήνα στο μεταξύ δεν πάνε στο αρχείο
+        arch.execute("BEGIN;")
+        arch.executemany("DELETE FROM temp.staging WHERE id = ?;", [(i,) for i in staged if i not in now])
+        arch.execute(f"INSERT OR REPLACE INTO main.production ({names}) SELECT {names} FROM temp.staging;")
+        arch.execute("COMMIT;")
+        conn.execute("INSERT INTO archive_moving VALUES (1);")
+        conn.execute("DELETE FROM production WHERE rec_date >= ? AND rec_date < ?;", (lo, hi))
+        conn.execute("DELETE FROM archive_moving;")
+        conn.execute("INSERT INTO archive_parts (year, path, through, rows, archived_at)"
+                     " VALUES (?, ?, ?, ?, datetime('now'))"
+                     " ON CONFLICT(year) DO UPDATE SET through = max(through, excluded.through),"
+                     " rows = rows + excluded.rows, archived_at = excluded.archived_at;",
+                     (int(year), name, last_day, len(now)))
+        return len(now)
+
+def _months(year):
+    for m in range(1, 13):
+        lo = date(year, m, 1)
+        hi = date(year + 1, 1, 1) if m == 12 else date(year, m + 1, 1)
+        yield lo.isoformat(), hi.isoformat(), date.fromordinal(hi.toordinal() - 1).isoformat()
+
+def archive_year(year, progress=None):
+    # Μεταφέρει όλες τις εγγραφές του έτους (και όσες προστέθηκαν αργότερα σε ήδη
+    # αρχειοθετημένο έτος). Επιστρέφει πόσες μεταφέρθηκαν.
+    from .schema import init_db
+    year = int(year)
+    if year >= date.today().year:
+        raise ValueError(f"Το {year} δεν έχει κλείσει — αρχειοθετούνται μόνο προηγούμενα έτη.")
+    init_db()
+    with read_conn() as live:
+        part = _parts(live, " WHERE year = ?", (year,))
+        cols = _columns(live)
+        months = {r[0] for r in live.execute(
+            "SELECT DISTINCT substr(rec_date, 1, 7) FROM production WHERE rec_date >= ? AND rec_date < ?;",
+            (f"{year}-01-01", f"{year + 1}-01-01"))}
+    if not months:
+        return 0
+    name = part[0][1] if part else archive_name(year)
+    moved = 0
+    with metrics.timed("archive", "archive_year"):
+        arch = _open_archive(archive_path(name))
+        try:
+            for lo, hi, last_day in _months(year):
+                if lo[:7] not in months:
+                    continue
+                for _attempt in range(MOVE_RETRIES):
+                    try:
+                        moved += _move_month(arch, cols, year, name, lo, hi, last_day,
+                                             _copy_month(arch, cols, lo, hi))
+                        break
+                    except _Stale:
+                        continue
+                else:
+                    raise RuntimeError(f"Ο μήνας {lo[:7]} αλλάζει συνεχώς — δοκιμάστε ξανά αργότερα.")
+                if progress:
+                    progress(moved)
+        finally:
+            arch.close()
+    return moved
+
+# -------------- Backup --------------
+def backup(dest_dir):
+    # VACUUM INTO: συνεπές, συμπιεσμένο αντίγραφο από ένα read snapshot, χωρίς να
+    # σταματά την καταχώριση (WAL). Πρώτα η ζωντανή βάση και μετά τα αρχεία που γράφει
+    # το δικό της archive_parts: ό,τι καλύπτει το αντίγραφο υπάρχει ήδη στα αρχεία.
+    # Τα αρχεία μπαίνουν σε έναν φάκελο με χρονοσφραγίδα, με τα ίδια ονόματα.
+    out = os.path.join(dest_dir, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(out)
+    main = os.path.join(out, os.path.basename(connection.DB_PATH))
+    with read_conn() as live, metrics.timed("backup", "live"):
+        live.execute("VACUUM INTO ?;", (main,))
+    copy = get_ro_conn(main)
+    try:
+        names = [r[1] for r in _parts(copy)]
+    finally:
+        copy.close()
+    written = [main]
+    for name in names:
+        with _part_conn(name) as conn, metrics.timed("backup", "archive"):
+            conn.execute("VACUUM INTO ?;", (os.path.join(out, name),))
+        written.append(os.path.join(out, name))
+    return written
@@ -0,0 +1,194 @@
+# production/audit.py — Ιστορικό αλλαγών (audit log) των εγγραφών
+#
+# Κάθε INSERT/UPDATE/DELETE του production γράφει, με trigger και μέσα στην ίδια
+# συναλλαγή, μία γραμμή στο audit_log με μόνο ό,τι άλλαξε (JSON):
+#   I: {στήλη: τιμή} για τις τιμές της νέας εγγραφής που διαφέρουν από το default
+#   U: {στήλη: [παλιά, νέα]} μόνο για τις στήλες που άλλαξαν
+#   D: όπως το I, για την εγγραφή που διαγράφηκε (στιγμιότυπο· οι στήλες που λείπουν
+#      είχαν την προεπιλεγμένη τιμή: 0 ή NULL, ενώ ένα NULL σε στήλη με default 0
+#      γράφεται ρητά ως null)
+#   A: {"year": έτος}: η εγγραφή μεταφέρθηκε αναλλοίωτη στο αρχείο του έτους (archive.py)
+# Έτσι καλύπτονται και η μαζική εισαγωγή και τα εξωτερικά εργαλεία. Το τερματικό
+# δεν το ξέρει το trigger: το γράφει ο writer μας πριν το commit στις γραμμές της
+# συναλλαγής του (όσες γράφτηκαν από άλλα εργαλεία μένουν με terminal NULL).
+#
+# Η κατάσταση μιας εγγραφής σε μια στιγμή T βγαίνει από την τρέχουσα, αναιρώντας
+# προς τα πίσω τα γεγονότα μετά το T (record_at).
+import json
+import os
+import socket
+import sqlite3
+import threading
+from dataclasses import MISSING, fields
+
+from . import connection
+from .cache import cached
+from .connection import read_conn
+from .models import COLUMNS, META_COLUMNS, ProductionRecord
+
+AUDIT_COLUMNS = tuple(c for c in COLUMNS if c not in META_COLUMNS)
+# οι προεπιλογές του μοντέλου είναι ίδιες με τα DEFAULT του πίνακα
+AUDIT_DEFAULTS = {f.name: (None if f.default is MISSING else f.default)
+                  for f in fields(ProductionRecord) if f.name in AUDIT_COLUMNS}
+AUDIT_TS = "strftime('%Y-%m-%d %H:%M:%f', 'now')"      # UTC, με χιλιοστά
+DEFAULT_TERMINAL = os.environ.get("ARI_TERMINAL") or socket.gethostname()
+
+def audit_ddl():
+    return """
+    CREATE TABLE IF NOT EXISTS audit_log (
+        seq      INTEGER PRIMARY KEY,
+        rec_id   INTEGER NOT NULL,
+        ts       TEXT NOT NULL,         -- UTC, YYYY-MM-DD HH:MM:SS.SSS
+        terminal TEXT,
+        op       TEXT NOT NULL,         -- I / U / D / A
+        diff     TEXT NOT NULL          -- JSON
+    );
+    CREATE INDEX IF NOT EXISTS idx_audit_rec_ts ON audit_log(rec_id, ts);
+    CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(ts);
+    -- append-only: μόνο το terminal συμπληρώνεται, και μόνο μία φορά
+    CREATE TRIGGER IF NOT EXISTS trg_audit_no_delete BEFORE DELETE ON audit_log BEGIN
+        SELECT RAISE(ABORT, 'audit_log is append-only');
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_audit_no_update BEFORE UPDATE OF seq, rec_id, ts, op, diff ON audit_log BEGIN
+        SELECT RAISE(ABORT, 'audit_log is append-only');
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_audit_terminal BEFORE UPDATE OF terminal ON audit_log
+    WHEN OLD.terminal IS NOT NULL BEGIN
+        SELECT RAISE(ABORT, 'audit_log is append-only');
+    END;
+    """
+
+def _diff_select(pairs, val):
+    # UNION ALL μίας γραμμής ανά στήλη -> ένα JSON object· καμία γραμμή audit αν δεν
+    # ταίριαξε καμία στήλη (n = 0)
+    union = "\n            UNION ALL ".join(pairs)
+    return f"(SELECT json_group_object(col, {val}) AS d, count(*) AS n FROM (\n            {union}))"
+
+def _audit_insert(ref, op, pairs, val="val"):
+    return (f"INSERT INTO audit_log (rec_id, ts, op, diff)"
+            f" SELECT {ref}.id, {AUDIT_TS}, '{op}', d FROM {_diff_select(pairs, val)} WHERE n > 0;")
+
+def _snapshot(ref):
+    # μόνο όσες στήλες δεν έχουν την προεπιλεγμένη τιμή (το NULL IS NOT 0 είναι αληθές)
+    return [f"SELECT '{c}' AS col, {ref}.{c} AS val"
+            f" WHERE {ref}.{c} IS NOT {'NULL' if AUDIT_DEFAULTS[c] is None else AUDIT_DEFAULTS[c]}"
+            for c in AUDIT_COLUMNS]
+
+def audit_triggers():
+    # το json_array χάνει τον τύπο JSON περνώντας από το subquery: json(val) στο object
+    upd = [f"SELECT '{c}' AS col, json_array(OLD.{c}, NEW.{c}) AS val WHERE OLD.{c} IS NOT NEW.{c}"
+           for c in AUDIT_COLUMNS]
+    return audit_ins_trigger() + f"""
+    CREATE TRIGGER IF NOT EXISTS trg_audit_upd AFTER UPDATE ON production BEGIN
+        {_audit_insert("NEW", "U", upd, val="json(val)")}
+    END;
+    """ + audit_del_trigger()
+
+def audit_ins_trigger():
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_audit_ins AFTER INSERT ON production BEGIN
+        {_audit_insert("NEW", "I", _snapshot("NEW"))}
+    END;
+    """
+
+def audit_del_trigger(when=""):
+    # when: προαιρετική συνθήκη (η αρχειοθέτηση γράφει δικά της, σύντομα γεγονότα "A")
+    cond = f"\n    WHEN {when}" if when else ""
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_audit_del AFTER DELETE ON production{cond} BEGIN
+        {_audit_insert("OLD", "D", _snapshot("OLD"))}
+    END;
+    """
+
+def audit_archive_trigger(when):
+    # μεταφορά στο αρχείο: ένα σύντομο γεγονός αντί για ολόκληρο στιγμιότυπο
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_audit_arch AFTER DELETE ON production
+    WHEN {when} BEGIN
+        INSERT INTO audit_log (rec_id, ts, op, diff)
+        VALUES (OLD.id, {AUDIT_TS}, 'A', json_object('year', CAST(substr(OLD.rec_date, 1, 4) AS INTEGER)));
+    END;
+    """
+
+# -------------- Τερματικό --------------
+# Κάθε session του Streamlit τρέχει στο δικό του thread: set_terminal() στην αρχή του rerun.
+_local = threading.local()
+_watermark = None               # max(seq) στην αρχή της τρέχουσας συναλλαγής του writer
+
+def set_terminal(name):
+    _local.terminal = str(name) if name else None
+
+def current_terminal():
+    return getattr(_local, "terminal", None) or DEFAULT_TERMINAL
+
+@connection.on_begin
+def _mark(conn):
+    global _watermark
+    try:
+        _watermark = conn.execute("SELECT IFNULL(max(seq), 0) FROM audit_log;").fetchone()[0]
+    except sqlite3.OperationalError:        # πριν τη migration του audit_log
+        _watermark = None
+
+@connection.before_commit
+def _stamp(conn):
+    # οι γραμμές με seq > watermark γράφτηκαν σε αυτή τη συναλλαγή (ο writer είναι ένας)
+    if _watermark is not None:
+        conn.execute("UPDATE audit_log SET terminal = ? WHERE seq > ? AND terminal IS NULL;",
+                     (current_terminal(), _watermark))
+
+# -------------- Αναγνώσεις --------------
+def _events(conn, where, params):
+    cur = conn.execute("SELECT seq, rec_id, ts, terminal, op, diff FROM audit_log" + where, params)
+    return [dict(seq=s, rec_id=r, ts=t, terminal=term, op=op, diff=json.loads(d))
+            for s, r, t, term, op, d in cur.fetchall()]
+
+@cached
+def history(rec_id):
+    # όλα τα γεγονότα μιας εγγραφής, τα νεότερα πρώτα
+    with read_conn() as conn:
+        return _events(conn, " WHERE rec_id = ? ORDER BY ts DESC, seq DESC", (int(rec_id),))
+
+@cached
+def audit_range(ts_from=None, ts_to=None, rec_id=None, limit=1000):
+    # γεγονότα σε χρονικό διάστημα [ts_from, ts_to) (UTC, "YYYY-MM-DD[ HH:MM:SS]"),
+    # προαιρετικά μίας εγγραφής (idx_audit_rec_ts) — και διαγραμμένης
+    q, p = " WHERE 1=1", []
+    if rec_id is not None:
+        q += " AND rec_id = ?"; p.append(int(rec_id))
+    if ts_from:
+        q += " AND ts >= ?"; p.append(str(ts_from))
+    if ts_to:
+        q += " AND ts < ?"; p.append(str(ts_to))
+    with read_conn() as conn:
+        return _events(conn, q + " ORDER BY ts DESC, seq DESC LIMIT ?", p + [int(limit)])
+
+def record_at(rec_id, ts):
+    # Η εγγραφή όπως ήταν τη στιγμή ts (UTC)· None αν δεν υπήρχε τότε.
+    # Για πριν την ενεργοποίηση του audit δίνει την παλαιότερη γνωστή μορφή της.
+    # Μια αρχειοθετημένη εγγραφή διαβάζεται από το αρχείο του έτους της.
+    with read_conn() as conn:
+        cur = conn.execute("SELECT * FROM production WHERE id = ?", (int(rec_id),))
+        row = cur.fetchone()
+        state = None if row is None else dict(zip([d[0] for d in cur.description], row))
+        later = _events(conn, " WHERE rec_id = ? AND ts > ? ORDER BY ts DESC, seq DESC",
+                        (int(rec_id), str(ts)))
+        last = later[:1] or _events(conn, " WHERE rec_id = ? ORDER BY ts DESC, seq DESC LIMIT 1",
+                                    (int(rec_id),))
+    if state is None and last and last[0]["op"] == "A":
+        from .archive import archived_row
+        state = archived_row(rec_id, last[0]["diff"]["year"])
+    for ev in later:
+        if ev["op"] == "A":
+            continue
+        if ev["op"] == "I":
+            state = None
+        elif ev["op"] == "D":
+            state = {"id": int(rec_id), **{c: ev["diff"].get(c, d) for c, d in AUDIT_DEFAULTS.items()}}
+        elif state is not None:
+            for c, (old, _new) in ev["diff"].items():
+                state[c] = old
+    if state is not None and any(ev["op"] != "A" for ev in later):
+        # version/updated_at δεν καταγράφονται: δεν αντιστοιχούν στην ανακατασκευή
+        state.pop("version", None)
+        state.pop("updated_at", None)
+    return state
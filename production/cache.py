@@ -0,0 +1,99 @@
+# production/cache.py — Cache αναγνώσεων με ακύρωση στο commit
+#
+# Κάθε rerun του Streamlit ξαναζητά τα ίδια δεδομένα. Τα αποτελέσματα κρατιούνται
+# εδώ (LRU + TTL + όριο μνήμης) και ισχύουν όσο δεν έχει γίνει commit:
+#  - οι δικές μας εγγραφές καθαρίζουν το cache στο commit του write_conn()
+#  - τις εγγραφές άλλων processes τις δείχνει το PRAGMA data_version, που αλλάζει
+#    όταν κάποια *άλλη* σύνδεση κάνει commit στη βάση.
+# Τα αποτελέσματα είναι κοινά ανάμεσα σε sessions: δεν τα τροποποιούμε.
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from . import connection, metrics
+
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_TTL_S = 300
+
+_cache = OrderedDict()          # key -> (token, expires, size, value)
+_cache_bytes = 0
+_cache_gen = 0
+_cache_lock = threading.Lock()
+
+_probe = None
+_probe_lock = threading.Lock()
+
+def _data_version():
+    global _probe
+    with _probe_lock:
+        if _probe is None:
+            _probe = connection.get_conn()
+        return _probe.execute("PRAGMA data_version;").fetchone()[0]
+
+@connection.on_commit
+def invalidate_cache():
+    global _cache_bytes, _cache_gen
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+        _cache_gen += 1
+
+@connection.on_close
+def _close_probe():
+    global _probe
+    with _probe_lock:
+        if _probe is not None:
+            _probe.close()
+            _probe = None
+    invalidate_cache()
+
+def cache_stats():
+    with _cache_lock:
+        return {"entries": len(_cache), "bytes": _cache_bytes, "generation": _cache_gen}
+
+def _sizeof(v):
+    if hasattr(v, "memory_usage"):
+        return int(v.memory_usage(index=True, deep=True).sum())
+    if isinstance(v, (tuple, list)):
+        return sys.getsizeof(v) + sum(_sizeof(x) for x in v)
+    if isinstance(v, dict):
+        return sys.getsizeof(v) + sum(_sizeof(k) + _sizeof(x) for k, x in v.items())
+    return sys.getsizeof(v)
+
+def cached(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kw):
+        global _cache_bytes
+        key = (fn.__name__, args, tuple(sorted(kw.items())))
+        # το token διαβάζεται ΠΡΙΝ το query: αν μεσολαβήσει commit, η εγγραφή
+        # απλώς θα θεωρηθεί παλιά στην επόμενη κλήση
+        t0 = time.perf_counter()
+        token = (_cache_gen, _data_version())
+        now = time.monotonic()
+        with _cache_lock:
+            hit = _cache.get(key)
+            if hit is not None and hit[0] == token and hit[1] > now:
+                _cache.move_to_end(key)
+                metrics.record("cache_hit", fn.__name__, time.perf_counter() - t0, nbytes=hit[2])
+                return hit[3]
+        value = fn(*args, **kw)
+        size = _sizeof(value)
+        # συνολικός χρόνος ανάγνωσης (sql + pandas + μέτρηση μεγέθους) και bytes αποτελέσματος
+        metrics.record("read", fn.__name__, time.perf_counter() - t0, nbytes=size)
+        if size > CACHE_MAX_BYTES // 4:
+            return value
+        with _cache_lock:
+            if token[0] != _cache_gen:
+                return value
+            old = _cache.pop(key, None)
+            if old is not None:
+                _cache_bytes -= old[2]
+            _cache[key] = (token, now + CACHE_TTL_S, size, value)
+            _cache_bytes += size
+            while len(_cache) > CACHE_MAX_ENTRIES or _cache_bytes > CACHE_MAX_BYTES:
+                _cache_bytes -= _cache.popitem(last=False)[1][2]
+        return value
+    return wrapper
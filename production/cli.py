@@ -0,0 +1,178 @@
+# production/cli.py — Εργασίες γραμμής εντολών χωρίς το UI
+#   python -m production import αρχείο.csv [--upsert] [--dry-run] [--errors λάθη.csv]
+#   python -m production export αρχείο.parquet [--from 2024-01-01] [--to ...] [--line 3]
+#   python -m production aggregate [--rebuild] [--from ...] [--to ...] [--by rec_date,line]
+#   python -m production generate 1000000 [--years 5]   (συνθετικά δεδομένα για benchmarks)
+#   python -m production audit [--id 152] [--from 2024-05-01] [--to ...]   (JSON lines)
+#   python -m production archive --before 2024 [--dry-run]      (κλειστά έτη σε αρχεία)
+#   python -m production backup αντίγραφα/                        (online, χωρίς διακοπή)
+#   python -m production check-plans
+import argparse
+import os
+import sys
+
+from . import connection
+
+def cmd_import(args):
+    from . import importer
+    res = importer.import_file(args.file, upsert=args.upsert, sheet=args.sheet,
+                               batch_size=args.batch_size, dry_run=args.dry_run)
+    print(f"έγκυρες: {res['valid']}  απορρίφθηκαν: {res['rejected']}  "
+          f"νέες: {res['inserted']}  ενημερώθηκαν: {res['updated']}  χωρίς αλλαγή: {res['unchanged']}  "
+          f"διπλές: {res['duplicates']}  απέτυχαν: {res['failed']}")
+    if res["ignored_columns"]:
+        print(f"αγνοήθηκαν στήλες (δεν αντιστοιχούν σε πεδίο): {', '.join(res['ignored_columns'])}",
+              file=sys.stderr)
+    errors = res["errors"]
+    if len(errors):
+        if args.errors:
+            errors.to_csv(args.errors, index=False)
+            print(f"αναφορά σφαλμάτων: {args.errors}")
+        else:
+            print(errors.to_string(index=False), file=sys.stderr)
+    return 1 if len(errors) else 0
+
+def cmd_export(args):
+    from .export import EXPORT_FORMATS, export_rows
+    from .schema import init_db
+    fmt = args.format or os.path.splitext(args.file)[1].lstrip(".").lower()
+    if fmt not in EXPORT_FORMATS:
+        print(f"άγνωστη μορφή: {fmt!r} (επιλογές: {', '.join(EXPORT_FORMATS)})", file=sys.stderr)
+        return 2
+    init_db()
+    with open(args.file, "wb") as f:
+        export_rows(f, fmt, args.date_from, args.date_to, args.line, chunksize=args.chunk_size)
+    print(f"export: {args.file}")
+    return 0
+
+def cmd_aggregate(args):
+    from .schema import init_db
+    from .summary import fetch_kpis, rebuild_summary
+    init_db()
+    if args.rebuild:
+        print(f"daily_summary: {rebuild_summary()} γραμμές", file=sys.stderr)
+    by = tuple(c.strip() for c in args.by.split(",") if c.strip())
+    fetch_kpis(args.date_from, args.date_to, args.line, by=by).to_csv(sys.stdout, index=False)
+    return 0
+
+def cmd_generate(args):
+    from . import synthetic
+    n = synthetic.generate(args.rows, lines=args.lines, codes=args.codes, seed=args.seed,
+                           years=args.years or synthetic.SYNTHETIC_YEARS,
+                           progress=lambda d: print(f"  {d}", end="\r", file=sys.stderr))
+    print(f"\nσυνθετικές εγγραφές: {n}")
+    return 0
+
+def cmd_audit(args):
+    import json
+    from .audit import audit_range
+    from .schema import init_db
+    init_db()
+    events = audit_range(args.date_from, args.date_to, rec_id=args.id, limit=args.limit)
+    for e in events:
+        print(json.dumps(e, ensure_ascii=False))
+    return 0
+
+def cmd_archive(args):
+    from datetime import date
+    from .archive import archive_status, archive_year
+    from .schema import init_db
+    init_db()
+    before = args.before or date.today().year
+    if before > date.today().year:
+        print(f"--before {before}: αρχειοθετούνται μόνο κλειστά έτη", file=sys.stderr)
+        return 2
+    status = archive_status()
+    if not args.dry_run:
+        for s in status:
+            if s["year"] < before and s["live_rows"]:
+                n = archive_year(s["year"], progress=lambda d: print(f"  {d}", end="\r", file=sys.stderr))
+                print(f"\r{s['year']}: μεταφέρθηκαν {n} εγγραφές", file=sys.stderr)
+        status = archive_status()
+    for s in status:
+        mark = "*" if args.dry_run and s["year"] < before and s["live_rows"] else " "
+        print(f"{mark}{s['year']}  ζωντανή: {s['live_rows']:>9}  αρχείο: {s['archived_rows']:>9}"
+              f"  {s['path'] or ''}")
+    return 0
+
+def cmd_backup(args):
+    from .archive import backup
+    from .schema import init_db
+    init_db()
+    for path in backup(args.dir):
+        print(path)
+    return 0
+
+def cmd_check_plans(args):
+    from .plans import check_query_plans
+    issues = check_query_plans()
+    for msg in issues:
+        print("PLAN:", msg, file=sys.stderr)
+    return 1 if issues else 0
+
+def _add_filters(p):
+    p.add_argument("--from", dest="date_from", help="από ημερομηνία (YYYY-MM-DD)")
+    p.add_argument("--to", dest="date_to", help="έως ημερομηνία (YYYY-MM-DD)")
+    p.add_argument("--line", type=int)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m production", description="ARI Production — εργασίες βάσης")
+    ap.add_argument("--db", default=connection.DB_PATH,
+                    help=f"αρχείο SQLite (προεπιλογή: $ARI_DB_PATH ή {connection.DB_PATH})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("import", help="μαζική εισαγωγή από CSV/Excel")
+    p.add_argument("file")
+    p.add_argument("--upsert", action="store_true",
+                   help="ενημέρωση αντί για διπλή εγγραφή με ίδιο (ημερομηνία, γραμμή, βάρδια, κωδικό)")
+    p.add_argument("--sheet", default=0, type=lambda v: int(v) if v.isdigit() else v,
+                   help="φύλλο Excel (όνομα ή αριθμός)")
+    p.add_argument("--batch-size", type=int, default=5000)
+    p.add_argument("--dry-run", action="store_true", help="μόνο επικύρωση, χωρίς εγγραφή")
+    p.add_argument("--errors", help="αποθήκευση της αναφοράς σφαλμάτων σε CSV")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export εγγραφών σε CSV/Parquet/Excel")
+    p.add_argument("file")
+    p.add_argument("--format", choices=["csv", "parquet", "xlsx"], help="προεπιλογή: από την κατάληξη")
+    p.add_argument("--chunk-size", type=int, default=5000)
+    _add_filters(p)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("aggregate", help="KPI από τον πίνακα σύνοψης (CSV στο stdout)")
+    p.add_argument("--rebuild", action="store_true", help="πλήρες ξαναχτίσιμο του daily_summary πρώτα")
+    p.add_argument("--by", default="rec_date", help="ομαδοποίηση: rec_date,line,code (κενό = σύνολα)")
+    _add_filters(p)
+    p.set_defaults(func=cmd_aggregate)
+
+    p = sub.add_parser("generate", help="συνθετικές βάρδιες για δοκιμές φόρτου")
+    p.add_argument("rows", type=int)
+    p.add_argument("--lines", type=int, default=12)
+    p.add_argument("--codes", type=int, default=400)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--years", type=int,
+                   help="τα δεδομένα μοιράζονται στα τελευταία τόσα έτη έως σήμερα (προεπιλογή: 5)")
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("audit", help="ιστορικό αλλαγών (JSON lines, τα νεότερα πρώτα)")
+    p.add_argument("--id", type=int, help="μόνο για μία εγγραφή")
+    p.add_argument("--from", dest="date_from", help="από (UTC, YYYY-MM-DD[ HH:MM:SS])")
+    p.add_argument("--to", dest="date_to", help="έως, χωρίς αυτό (UTC)")
+    p.add_argument("--limit", type=int, default=1000)
+    p.set_defaults(func=cmd_audit)
+
+    p = sub.add_parser("archive", help="μεταφορά κλειστών ετών σε αρχεία ανά έτος")
+    p.add_argument("--before", type=int, help="όλα τα έτη πριν από αυτό (προεπιλογή: το τρέχον)")
+    p.add_argument("--dry-run", action="store_true", help="μόνο η κατάσταση· με * όσα θα μεταφερθούν")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("backup", help="online αντίγραφο της βάσης και των αρχείων (VACUUM INTO)")
+    p.add_argument("dir", help="φάκελος· κάθε αντίγραφο σε υποφάκελο με χρονοσφραγίδα")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("check-plans", help="έλεγχος ότι τα βασικά queries χρησιμοποιούν index")
+    p.set_defaults(func=cmd_check_plans)
+
+    args = ap.parse_args(argv)
+    connection.set_db_path(args.db)
+    return args.func(args)
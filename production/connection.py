@@ -0,0 +1,198 @@
+# production/connection.py — Συνδέσεις SQLite: pool αναγνώσεων, ένας σειριακός writer
+#
+# Το Streamlit ξανατρέχει το app.py σε κάθε αλληλεπίδραση, αλλά τα imported modules
+# μένουν στο sys.modules. Γι' αυτό οι συνδέσεις ζουν εδώ, μία φορά ανά process,
+# και όχι σε κάθε κλήση.
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from . import metrics
+
+DB_PATH = os.environ.get("ARI_DB_PATH", "ari_production.db")
+
+READ_POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 5000      # αναμονή της SQLite πριν πετάξει "database is locked"
+WRITE_RETRIES = 5           # επιπλέον επαναλήψεις σε επίπεδο εφαρμογής
+RETRY_BACKOFF_S = 0.05      # αρχική καθυστέρηση, διπλασιάζεται σε κάθε προσπάθεια
+
+def get_conn(path=None):
+    # isolation_level=None: τις συναλλαγές τις ανοίγουμε ρητά (BEGIN IMMEDIATE στον writer)
+    # path: άλλο αρχείο με τις ίδιες ρυθμίσεις (π.χ. αρχείο έτους, βλ. archive.py)
+    with metrics.timed("connect", "get_conn"):
+        conn = sqlite3.connect(path or DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES,
+                               check_same_thread=False, isolation_level=None,
+                               timeout=BUSY_TIMEOUT_MS / 1000)
+        # τα PRAGMA εφαρμόζονται μία φορά, όταν δημιουργείται η σύνδεση
+        conn.execute("PRAGMA foreign_keys = ON;")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
+    return conn
+
+def get_ro_conn(path):
+    # μόνο για ανάγνωση (mode=ro): κανένα PRAGMA που γράφει, το journal_mode μένει ό,τι έχει
+    with metrics.timed("connect", "get_ro_conn"):
+        return sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True,
+                               detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                               isolation_level=None, timeout=BUSY_TIMEOUT_MS / 1000)
+
+_read_pool = queue.LifoQueue()
+_read_created = 0
+_pool_lock = threading.Lock()
+
+_writer = None
+_write_lock = threading.Lock()
+
+# καλούνται μετά από κάθε επιτυχημένο commit (π.χ. καθάρισμα του cache)
+_commit_hooks = []
+# καλούνται στο close_all()
+_close_hooks = []
+# fn(conn) μέσα στη συναλλαγή του writer: αμέσως μετά το BEGIN / ακριβώς πριν το COMMIT
+_begin_hooks = []
+_precommit_hooks = []
+
+def on_commit(fn):
+    _commit_hooks.append(fn)
+    return fn
+
+def on_begin(fn):
+    _begin_hooks.append(fn)
+    return fn
+
+def before_commit(fn):
+    _precommit_hooks.append(fn)
+    return fn
+
+def on_close(fn):
+    _close_hooks.append(fn)
+    return fn
+
+@contextmanager
+def read_conn():
+    global _read_created
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            create = _read_created < READ_POOL_SIZE
+            if create:
+                _read_created += 1
+        if create:
+            try:
+                conn = get_conn()
+            except Exception:
+                with _pool_lock:
+                    _read_created -= 1
+                raise
+        else:
+            # όλες οι συνδέσεις δανεισμένες: μετράμε την αναμονή
+            with metrics.timed("wait", "read_pool"):
+                conn = _read_pool.get()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        _read_pool.put(conn)
+
+# Αρχεία που μόνο διαβάζονται (αρχειοθετημένα έτη): ένα pool ανά αρχείο, που μεγαλώνει
+# έως τις ταυτόχρονες αναγνώσεις του ίδιου αρχείου και κλείνει στο close_all().
+_ro_pools = {}
+
+@contextmanager
+def read_only_conn(path):
+    path = os.path.abspath(path)
+    with _pool_lock:
+        pool = _ro_pools.setdefault(path, queue.LifoQueue())
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = get_ro_conn(path)
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        pool.put(conn)
+
+@on_close
+def _close_ro_pools():
+    with _pool_lock:
+        pools = list(_ro_pools.values())
+        _ro_pools.clear()
+    for pool in pools:
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+def _is_busy(exc):
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+@contextmanager
+def write_conn():
+    # Ένας writer ανά process: το lock σειριοποιεί τα threads του Streamlit, το
+    # BEGIN IMMEDIATE παίρνει το write lock της βάσης από την αρχή, ώστε μια
+    # σύγκρουση με άλλο process να φανεί εδώ και όχι στη μέση της συναλλαγής.
+    global _writer
+    t0 = time.perf_counter()
+    with _write_lock:
+        if _writer is None:
+            _writer = get_conn()
+        conn = _writer
+        delay = RETRY_BACKOFF_S
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                conn.execute("BEGIN IMMEDIATE;")
+                break
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == WRITE_RETRIES:
+                    metrics.record("wait", "write_lock", time.perf_counter() - t0, error=True)
+                    raise
+                time.sleep(delay)
+                delay *= 2
+        # αναμονή για το lock του process και το write lock της βάσης
+        metrics.record("wait", "write_lock", time.perf_counter() - t0)
+        try:
+            for fn in _begin_hooks:
+                fn(conn)
+            yield conn
+            for fn in _precommit_hooks:
+                fn(conn)
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            with metrics.timed("commit", "write_conn"):
+                conn.commit()
+            for fn in _commit_hooks:
+                fn()
+
+def close_all():
+    global _writer, _read_created
+    with _write_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+    with _pool_lock:
+        while True:
+            try:
+                _read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        _read_created = 0
+    for fn in _close_hooks:
+        fn()
+
+def set_db_path(path):
+    # Αλλαγή βάσης (CLI --db, benchmarks): κλείνουν όλες οι συνδέσεις της προηγούμενης.
+    global DB_PATH
+    close_all()
+    DB_PATH = str(path)
@@ -0,0 +1,83 @@
+# production/crud.py — Εγγραφές στον πίνακα production
+#
+# Optimistic concurrency: κάθε UPDATE αυξάνει το version της γραμμής. Με
+# expected_version, το UPDATE/DELETE εφαρμόζεται μόνο αν η γραμμή δεν άλλαξε από
+# τότε που φορτώθηκε· αλλιώς ConflictError με την τρέχουσα μορφή της.
+import sys
+
+from . import metrics
+from .connection import write_conn
+
+# UTC· το ίδιο και στο trigger της migration 5 για όσους γράφουν χωρίς αυτό
+VERSION_BUMP = "version = version + 1, updated_at = datetime('now')"
+
+class ConflictError(Exception):
+    # current: η εγγραφή όπως είναι τώρα στη βάση (dict) ή None αν διαγράφηκε
+    def __init__(self, id_, current):
+        super().__init__(f"Η εγγραφή #{id_} άλλαξε από άλλο τερματικό.")
+        self.id = id_
+        self.current = current
+
+def _execute(conn, name, sql, params):
+    # μετράει μόνο το statement· η αναμονή για το lock και το commit μετρώνται στο write_conn()
+    with metrics.timed("sql", name, sql=sql, params=params) as m:
+        cur = conn.execute(sql, params)
+        m["rows"] = cur.rowcount
+        m["bytes"] = sum(sys.getsizeof(v) for v in params)
+    return cur
+
+def _current(conn, id_):
+    cur = conn.execute("SELECT * FROM production WHERE id=?", (id_,))
+    row = cur.fetchone()
+    return None if row is None else dict(zip([d[0] for d in cur.description], row))
+
+def _as_number(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return v
+
+def same_value(old, new):
+    # Η φόρμα δείχνει τα κενά ως "" ή 0: None, "" και 0 θεωρούνται ίδια τιμή.
+    if old in (None, "") or new in (None, ""):
+        return (old in (None, "", 0)) and (new in (None, "", 0))
+    # Στήλες REAL/INTEGER με τιμή από text_input (π.χ. Κωδικός Τμχ): η SQLite θα
+    # αποθήκευε το "1.5" ως 1.5, οπότε συγκρίνουμε ως αριθμούς.
+    if isinstance(old, (int, float)) != isinstance(new, (int, float)):
+        return _as_number(old) == _as_number(new)
+    return old == new
+
+def changed_fields(old, new):
+    # {στήλη: νέα τιμή} μόνο για ό,τι διαφέρει από τη φορτωμένη εγγραφή old (dict)
+    return {k: v for k, v in new.items() if not same_value(old.get(k), v)}
+
+def insert_row(**kw):
+    cols = ",".join(kw.keys())
+    placeholders = ",".join(["?"]*len(kw))
+    with write_conn() as conn:
+        cur = _execute(conn, "insert_row", f"INSERT INTO production ({cols}) VALUES ({placeholders})",
+                       tuple(kw.values()))
+        return cur.lastrowid
+
+def update_row(id_, expected_version=None, **kw):
+    # Γράφει μόνο τις στήλες του kw· επιστρέφει το νέο version.
+    sets = ",".join([f"{k}=?" for k in kw.keys()] + [VERSION_BUMP])
+    sql, params = f"UPDATE production SET {sets} WHERE id=?", (*kw.values(), id_)
+    if expected_version is not None:
+        sql, params = sql + " AND version=?", (*params, int(expected_version))
+    with write_conn() as conn:
+        if _execute(conn, "update_row", sql, params).rowcount == 0:
+            raise ConflictError(id_, _current(conn, id_))
+        return conn.execute("SELECT version FROM production WHERE id=?", (id_,)).fetchone()[0]
+
+def delete_row(id_, expected_version=None):
+    sql, params = "DELETE FROM production WHERE id=?", (id_,)
+    if expected_version is not None:
+        sql, params = sql + " AND version=?", (id_, int(expected_version))
+    with write_conn() as conn:
+        if _execute(conn, "delete_row", sql, params).rowcount == 0 and expected_version is not None:
+            raise ConflictError(id_, _current(conn, id_))
+
+def insert_record(rec):
+    # ProductionRecord -> νέα εγγραφή· επιστρέφει το id
+    return insert_row(**rec.to_payload())
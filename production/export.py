@@ -0,0 +1,132 @@
+# production/export.py — Export σε CSV / Parquet / Excel
+#
+# Το export διαβάζει με cursor σε κομμάτια των EXPORT_CHUNK_ROWS γραμμών και τα γράφει
+# κατευθείαν στο αρχείο, οπότε η μνήμη δεν εξαρτάται από το εύρος ημερομηνιών.
+import csv
+import io
+from itertools import islice
+
+from .archive import sources
+from .connection import read_conn
+from .queries import ORDER_BY, _source_query, _where, merge_sorted
+
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORT_FORMATS = {
+    # fmt: (ετικέτα, mime, κατάληξη)
+    "csv": ("CSV", "text/csv", "csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+XLSX_MAX_ROWS = 1_048_575    # όριο γραμμών φύλλου Excel (χωρίς την επικεφαλίδα)
+
+def iter_chunks(date_from=None, date_to=None, line=None, chunksize=EXPORT_CHUNK_ROWS):
+    # yield (columns, rows) ανά κομμάτι· με αρχειοθετημένα έτη οι cursors όλων των πηγών
+    # συγχωνεύονται καθώς διαβάζονται
+    where, p = _where(date_from, date_to, line)
+    with sources(date_from, date_to) as srcs:
+        curs = [s.conn.execute(*_source_query(s, "*", where, p, ORDER_BY)) for s in srcs]
+        cols = [d[0] for d in curs[0].description]
+        rows = merge_sorted(cols, curs)
+        try:
+            while chunk := list(islice(rows, chunksize)):
+                yield cols, chunk
+        finally:
+            for cur in curs:
+                cur.close()
+
+def _column_types():
+    with read_conn() as conn:
+        return {r[1]: (r[2] or "").upper() for r in conn.execute("PRAGMA table_info(production);")}
+
+def _mixed_columns(date_from=None, date_to=None, line=None):
+    # Στήλες REAL/INTEGER που στο διάστημα έχουν και μη αριθμητικό κείμενο (π.χ. "T-12"
+    # στον Κωδικό Τμχ από τη φόρμα επεξεργασίας) -> "text", ή INTEGER με δεκαδικά -> "real"
+    types = _column_types()
+    checks = []
+    for c, t in types.items():
+        if t in ("INTEGER", "REAL"):
+            checks.append((c, "text", f"MAX(typeof({c}) = 'text' AND {c} <> '')"))
+        if t == "INTEGER":
+            checks.append((c, "real", f"MAX(typeof({c}) = 'real' AND {c} <> CAST({c} AS INTEGER))"))
+    where, p = _where(date_from, date_to, line)
+    found = set()
+    with sources(date_from, date_to) as srcs:
+        for s in srcs:
+            row = s.conn.execute(*_source_query(s, ", ".join(e for _, _, e in checks), where, p)).fetchone()
+            found |= {(c, kind) for (c, kind, _), hit in zip(checks, row) if hit}
+    mixed = {c: "real" for c, kind in found if kind == "real"}
+    mixed.update({c: "text" for c, kind in found if kind == "text"})
+    return mixed
+
+def _write_csv(fileobj, chunks):
+    out = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    w = csv.writer(out)
+    header = False
+    for cols, rows in chunks:
+        if not header:
+            w.writerow(cols); header = True
+        w.writerows(rows)
+    if not header:
+        w.writerow(list(_column_types()))
+    out.flush()
+    out.detach()
+
+def _to_num(cast):
+    # κενό κείμενο -> None· στήλες με άλλο κείμενο γράφονται ως string (βλ. _mixed_columns)
+    def conv(v):
+        if v is None or v == "":
+            return None
+        try:
+            return cast(v)
+        except (TypeError, ValueError):
+            return None
+    return conv
+
+def _write_parquet(fileobj, chunks, mixed=None):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Για export σε Parquet χρειάζεται το pyarrow (pip install pyarrow).")
+    # το σχήμα βγαίνει από τους δηλωμένους τύπους του πίνακα, ώστε να είναι ίδιο σε όλα
+    # τα κομμάτια (και σε άδειο αποτέλεσμα)· οι στήλες του _mixed_columns() γράφονται ως
+    # κείμενο/δεκαδικοί, ώστε να μη χάνεται καμία τιμή
+    widen = {"text": "TEXT", "real": "REAL"}
+    types = {c: widen.get((mixed or {}).get(c), t) for c, t in _column_types().items()}
+    arrow_type = {"INTEGER": (pa.int64(), _to_num(int)), "REAL": (pa.float64(), _to_num(float))}
+    text = (pa.string(), lambda v: None if v is None else str(v))
+    spec = [arrow_type.get(t, text) for t in types.values()]
+    schema = pa.schema([(c, t) for c, (t, _) in zip(types, spec)])
+    with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+        for cols, rows in chunks:
+            arrays = [pa.array([conv(v) for v in col_vals], type=t)
+                      for (t, conv), col_vals in zip(spec, zip(*rows))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+def _write_xlsx(fileobj, chunks):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Για export σε Excel χρειάζεται το openpyxl (pip install openpyxl).")
+    wb = Workbook(write_only=True)    # write-only: οι γραμμές δεν κρατιούνται στη μνήμη
+    ws = wb.create_sheet("production")
+    n = 0
+    for cols, rows in chunks:
+        if n == 0:
+            ws.append(cols)
+        n += len(rows)
+        if n > XLSX_MAX_ROWS:
+            raise ValueError(f"Πάνω από {XLSX_MAX_ROWS} γραμμές — στενέψτε το φίλτρο ή επιλέξτε CSV/Parquet.")
+        for row in rows:
+            ws.append(row)
+    if n == 0:
+        ws.append(list(_column_types()))
+    wb.save(fileobj)
+
+def export_rows(fileobj, fmt="csv", date_from=None, date_to=None, line=None, chunksize=EXPORT_CHUNK_ROWS):
+    writers = {"csv": _write_csv, "parquet": _write_parquet, "xlsx": _write_xlsx}
+    if fmt not in writers:
+        raise ValueError(f"Άγνωστη μορφή export: {fmt}")
+    kw = {"mixed": _mixed_columns(date_from, date_to, line)} if fmt == "parquet" else {}
+    writers[fmt](fileobj, iter_chunks(date_from, date_to, line, chunksize), **kw)
@@ -0,0 +1,117 @@
+# production/fts.py — Αναζήτηση κειμένου (FTS5) σε κωδικό και σχόλια L3/L8/L24/L25
+#
+# Το production_fts είναι πίνακας FTS5 "external content": κρατά μόνο το ευρετήριο,
+# το κείμενο το διαβάζει από το view production_fts_src. Συγχρονίζεται με triggers σε
+# κάθε INSERT/UPDATE/DELETE του production (όπως ο daily_summary).
+#
+# Ο tokenizer unicode61 αφαιρεί τόνους μόνο από λατινικούς χαρακτήρες, οπότε τους
+# ελληνικούς τόνους (και το τελικό ς) τους "διπλώνουμε" εμείς: στο view με replace()
+# (ώστε τα triggers να δουλεύουν και από εξωτερικά εργαλεία, χωρίς Python συναρτήσεις)
+# και στο κείμενο αναζήτησης με fold_text() — με τον ίδιο πίνακα αντιστοιχιών.
+from . import metrics
+from .cache import cached
+from .connection import read_conn, write_conn
+from .queries import _read_frame, _where
+
+FTS_COLUMNS = ("code", "l3_comment", "l8_comment", "l24_comment", "l25_comment")
+FTS_WEIGHTS = (4.0, 1.0, 1.0, 1.0, 1.0)    # bm25: ταίριασμα στον κωδικό μετράει περισσότερο
+
+_FOLD = {"ά": "α", "έ": "ε", "ή": "η", "ί": "ι", "ό": "ο", "ύ": "υ", "ώ": "ω",
+         "ϊ": "ι", "ϋ": "υ", "ΐ": "ι", "ΰ": "υ", "ς": "σ",
+         "Ά": "Α", "Έ": "Ε", "Ή": "Η", "Ί": "Ι", "Ό": "Ο", "Ύ": "Υ", "Ώ": "Ω", "Ϊ": "Ι", "Ϋ": "Υ"}
+_FOLD_TABLE = str.maketrans(_FOLD)
+
+def fold_text(s):
+    return str(s or "").translate(_FOLD_TABLE)
+
+def _fold_sql(expr):
+    for a, b in _FOLD.items():
+        expr = f"replace({expr}, '{a}', '{b}')"
+    return expr
+
+def fts_ddl():
+    src = ", ".join(f"{_fold_sql(c)} AS {c}" for c in FTS_COLUMNS)
+    return f"""
+    CREATE VIEW IF NOT EXISTS production_fts_src AS SELECT id, {src} FROM production;
+    CREATE VIRTUAL TABLE IF NOT EXISTS production_fts USING fts5(
+        {", ".join(FTS_COLUMNS)},
+        content='production_fts_src', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    );
+    """
+
+def _fts_values(ref):
+    return ", ".join([f"{ref}.id"] + [_fold_sql(f"{ref}.{c}") for c in FTS_COLUMNS])
+
+def fts_triggers():
+    cols = ", ".join(FTS_COLUMNS)
+    add = f"INSERT INTO production_fts(rowid, {cols}) VALUES ({_fts_values('NEW')});"
+    # σε external content το 'delete' θέλει τις παλιές τιμές, όπως είχαν ευρετηριαστεί
+    sub = (f"INSERT INTO production_fts(production_fts, rowid, {cols})"
+           f" VALUES ('delete', {_fts_values('OLD')});")
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_fts_ins AFTER INSERT ON production BEGIN
+        {add}
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_fts_del AFTER DELETE ON production BEGIN
+        {sub}
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_fts_upd AFTER UPDATE OF id, {cols} ON production BEGIN
+        {sub}
+        {add}
+    END;
+    """
+
+def fts_rebuild_sql():
+    # ξαναχτίζει όλο το ευρετήριο από το view (αρχικό γέμισμα ή επισκευή)
+    return "INSERT INTO production_fts(production_fts) VALUES ('rebuild');"
+
+def rebuild_fts():
+    from .schema import init_db
+    init_db()
+    with write_conn() as conn:
+        conn.execute(fts_rebuild_sql())
+
+def fts_query(text):
+    # Κάθε λέξη γίνεται πρόθεμα ("λέξη"*) και όλες μαζί AND· τα εισαγωγικά του χρήστη
+    # αφαιρούνται, ώστε να μη φτάνει ποτέ στην SQLite άκυρη σύνταξη FTS5.
+    toks = [t.replace('"', "") for t in fold_text(text).split()]
+    return " ".join(f'"{t}"*' for t in toks if t)
+
+def _match_query(select, text, date_from=None, date_to=None, line=None):
+    match = fts_query(text)
+    if not match:
+        raise ValueError("Κενή αναζήτηση κειμένου.")
+    where, p = _where(date_from, date_to, line)
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    q = (f"SELECT {select} FROM"
+         f" (SELECT rowid AS id, bm25(production_fts, {weights}) AS score"
+         f"  FROM production_fts WHERE production_fts MATCH ?) f"
+         f" JOIN production p ON p.id = f.id" + where)
+    return q, [match] + p
+
+def _search_page_query(text, date_from=None, date_to=None, line=None, page_size=50, after=None):
+    q, p = _match_query("f.score, p.*", text, date_from, date_to, line)
+    if after is not None:
+        q += " AND (f.score, f.id) > (?, ?)"; p += [float(after[0]), int(after[1])]
+    # +1 γραμμή για να ξέρουμε αν υπάρχει επόμενη σελίδα
+    return q + " ORDER BY f.score, f.id LIMIT ?", p + [int(page_size) + 1]
+
+@cached
+def search_page(text, date_from=None, date_to=None, line=None, page_size=50, after=None):
+    # Ταξινόμηση κατά συνάφεια (bm25: μικρότερο = καλύτερο), με keyset pagination όπως
+    # το fetch_page: after = (score, id) της τελευταίας γραμμής. Επιστρέφει (df, next_cursor).
+    q, p = _search_page_query(text, date_from, date_to, line, page_size, after)
+    df = _read_frame("search_page", q, p)
+    if len(df) <= page_size:
+        return df, None
+    df = df.iloc[:page_size]
+    last = df.iloc[-1]
+    return df, (float(last["score"]), int(last["id"]))
+
+@cached
+def search_count(text, date_from=None, date_to=None, line=None):
+    q, p = _match_query("COUNT(*)", text, date_from, date_to, line)
+    with read_conn() as conn, metrics.timed("sql", "search_count", sql=q, params=p) as m:
+        m["rows"] = 1
+        return conn.execute(q, p).fetchone()[0]
@@ -0,0 +1,217 @@
+# production/importer.py — Μαζική εισαγωγή βαρδιών από CSV/Excel (παλιά χαρτιά, exports PLC)
+#
+# Η επικύρωση γίνεται διανυσματικά πάνω στο DataFrame με τους κανόνες της φόρμας
+# (models.SHIFT_RE κ.λπ.) και οι έγκυρες γραμμές γράφονται με executemany σε μεγάλες
+# συναλλαγές. Με upsert, μια γραμμή με ίδιο φυσικό κλειδί ενημερώνει την υπάρχουσα
+# εγγραφή αντί να φτιάξει διπλή.
+import os
+import sqlite3
+import pandas as pd
+
+from .connection import read_conn, write_conn
+from .crud import VERSION_BUMP
+from .models import META_COLUMNS, SHIFT_RE
+from .schema import init_db
+
+NATURAL_KEY = ("rec_date", "line", "shift_start", "code")
+IMPORT_BATCH_ROWS = 5000
+
+# Επικεφαλίδες όπως στη φόρμα -> στήλες του πίνακα (σύγκριση χωρίς κεφαλαία/κενά)
+FORM_LABELS = {
+    "date": "rec_date", "line": "line", "group of lines": "group_lines", "κωδικός": "code",
+    "shift start": "shift_start", "shift end": "shift_end", "filling ws": "filling_ws",
+    "catering": "catering", "control": "control", "weighting": "weighting",
+    "packaging": "packaging", "control in packaging": "control_in_pack",
+    "produced pcs": "produced_pcs", "reworked pcs": "reworked_pcs",
+    "wrong weight (reworked pcs)": "wrong_weight_reworked", "destroyed": "destroyed",
+    "red pepper": "red_pepper", "green pepper": "green_pepper",
+    "red cherry pepper": "red_cherry_pepper", "snack pepper": "snack_pepper",
+    "yellow cherry pepper": "yellow_cherry_pepper", "jalapeno": "jalapeno",
+    "stuffed olives": "stuffed_olives",
+    **{f"κωδικός τμχ {i}": f"code_tmx{i}" for i in range(1, 7)},
+    **{f"l{i} comment": f"l{i}_comment" for i in (3, 8, 24, 25)},
+}
+
+def table_columns():
+    # name -> (declared type, default) από τον ίδιο τον πίνακα
+    init_db()
+    with read_conn() as conn:
+        return {r[1]: ((r[2] or "").upper(), r[4])
+                for r in conn.execute("PRAGMA table_info(production);") if r[1] not in META_COLUMNS}
+
+def read_table(src, name=None, sheet=0):
+    # src: διαδρομή αρχείου ή file-like (π.χ. από st.file_uploader)· όλα ως κείμενο,
+    # οι μετατροπές γίνονται στο prepare()
+    name = str(name or getattr(src, "name", None) or src)
+    if os.path.splitext(name)[1].lower() in (".xlsx", ".xlsm", ".xls"):
+        return pd.read_excel(src, sheet_name=sheet, dtype=str)
+    return pd.read_csv(src, dtype=str, sep=None, engine="python", encoding="utf-8-sig")
+
+def _column_mapping(df):
+    # αρχική επικεφαλίδα -> στήλη του πίνακα (ή η κανονικοποιημένη επικεφαλίδα, αν δεν ταιριάζει)
+    mapping = {}
+    for c in df.columns:
+        key = " ".join(str(c).strip().lower().split())
+        mapping[c] = FORM_LABELS.get(key, key)
+    return mapping
+
+def _add_error(errors, mask, msg):
+    errors[mask] = errors[mask] + msg + "; "
+
+def prepare(raw):
+    # -> (clean, report, ignored): clean = έγκυρες γραμμές έτοιμες για εισαγωγή,
+    # report = (row, errors) για όσες απορρίφθηκαν (row = αριθμός γραμμής στο αρχείο),
+    # ignored = επικεφαλίδες του αρχείου που δεν αντιστοιχούν σε πεδίο (π.χ. ορθογραφικό λάθος)
+    cols = table_columns()
+    mapping = _column_mapping(raw)
+    ignored = [str(orig) for orig, c in mapping.items() if c not in cols and c not in META_COLUMNS]
+    df = raw.rename(columns=mapping).reset_index(drop=True)
+    unknown = [c for c in df.columns if c not in cols]
+    df = df.drop(columns=unknown)
+    errors = pd.Series("", index=df.index, dtype=object)
+    for c in NATURAL_KEY + ("group_lines", "shift_end"):
+        if c not in df.columns:
+            df[c] = None
+    text = {c: df[c].fillna("").astype(str).str.strip() for c in df.columns}
+
+    # ίδιοι κανόνες με τη φόρμα (models.validate_record)
+    _add_error(errors, text["code"] == "", "Κωδικός")
+    _add_error(errors, ~text["group_lines"].str.isdigit(), "group of lines (πρέπει να είναι αριθμός)")
+    for c, lbl in [("shift_start", "Shift Start"), ("shift_end", "Shift End")]:
+        _add_error(errors, ~text[c].str.match(SHIFT_RE.pattern), f"{lbl} (HH:MM)")
+
+    # ημερομηνία: ISO (YYYY-MM-DD) ή όπως στη φόρμα (DD/MM/YYYY)
+    d = pd.to_datetime(text["rec_date"], format="%Y-%m-%d", errors="coerce")
+    d = d.fillna(pd.to_datetime(text["rec_date"].str[:10], format="%d/%m/%Y", errors="coerce"))
+    _add_error(errors, d.isna(), "Date")
+
+    out = pd.DataFrame(index=df.index)
+    out["rec_date"] = d.dt.strftime("%Y-%m-%d")
+    for c in df.columns:
+        if c == "rec_date":
+            continue
+        ctype, default = cols[c]
+        if ctype in ("INTEGER", "REAL"):
+            num = pd.to_numeric(text[c].str.replace(",", ".", regex=False), errors="coerce")
+            if c == "group_lines":      # ελέγχθηκε ήδη παραπάνω
+                out[c] = num
+                continue
+            _add_error(errors, num.isna() & (text[c] != ""), c)
+            if ctype == "INTEGER":
+                _add_error(errors, num.notna() & (num % 1 != 0), c)
+            if default is not None:
+                num = num.fillna(float(default))
+            out[c] = num
+        elif c in ("shift_start", "shift_end"):
+            # "6:00" -> "06:00": αλλιώς δεν ταιριάζει με το "06:00" της βάσης στο κλειδί του upsert
+            out[c] = text[c].where(~text[c].str.match(SHIFT_RE.pattern), text[c].str.zfill(5))
+        else:
+            out[c] = text[c].where(text[c] != "", None)
+    _add_error(errors, out["line"].isna() | (out["line"] < 1), "Line")
+
+    bad = errors != ""
+    report = pd.DataFrame({"row": df.index[bad] + 2, "errors": errors[bad].str.rstrip("; ")})
+    clean = out[~bad].copy()
+    clean.insert(0, "_row", clean.index + 2)    # +2: επικεφαλίδα και αρίθμηση από 1
+    return clean, report, ignored
+
+def _py(v):
+    # numpy/pandas -> τύποι Python για το sqlite3
+    if v is None or (isinstance(v, float) and v != v):
+        return None
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+def drop_duplicates(clean):
+    # μέσα στο ίδιο αρχείο κρατάμε την τελευταία γραμμή κάθε φυσικού κλειδιού
+    # -> (clean, report): report = (row, errors) για όσες παραλείφθηκαν
+    keys = list(NATURAL_KEY)
+    dup = clean.duplicated(keys, keep="last")
+    if not dup.any():
+        return clean, pd.DataFrame(columns=["row", "errors"])
+    kept = clean[~dup].set_index(keys)["_row"]
+    winners = kept.loc[pd.MultiIndex.from_frame(clean.loc[dup, keys])].tolist()
+    report = pd.DataFrame({"row": clean.loc[dup, "_row"].tolist(),
+                           "errors": [f"διπλό κλειδί στο αρχείο — ισχύει η γραμμή {w}" for w in winners]})
+    return clean[~dup], report
+
+def import_frame(clean, upsert=False, batch_size=IMPORT_BATCH_ROWS):
+    # -> dict(inserted, updated, unchanged, failed, duplicates, errors=DataFrame(row, errors))
+    cols = [c for c in clean.columns if c != "_row"]
+    result = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "duplicates": 0}
+    failures = []
+    dup_report = None
+    if upsert:
+        clean, dup_report = drop_duplicates(clean)
+        result["duplicates"] = len(dup_report)
+    ins_sql = f"INSERT INTO production ({','.join(cols)}) VALUES ({','.join('?' * len(cols))})"
+    upd_cols = [c for c in cols if c not in NATURAL_KEY]
+    # μόνο αν κάποια τιμή διαφέρει: αλλιώς ένα ξανά-import του ίδιου αρχείου θα ανέβαζε
+    # το version και θα έβγαζε ψεύτικη σύγκρουση στις ανοιχτές φόρμες επεξεργασίας
+    upd_sql = (f"UPDATE production SET {','.join(f'{c}=?' for c in upd_cols)}, {VERSION_BUMP}"
+               f" WHERE id=? AND ({' OR '.join(f'{c} IS NOT ?' for c in upd_cols)})")
+    key_sql = ("SELECT id FROM production WHERE line=? AND rec_date=? AND shift_start=? AND code=?"
+               " ORDER BY id LIMIT 1")
+    records = [[_py(v) for v in r] for r in clean[cols].itertuples(index=False, name=None)]
+    rownos = clean["_row"].tolist()
+    key_idx = [cols.index(k) for k in ("line", "rec_date", "shift_start", "code")]
+    upd_idx = [cols.index(c) for c in upd_cols]
+
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        rows = rownos[start:start + batch_size]
+        with write_conn() as conn:
+            inserts, updates = [], []
+            for rowno, rec in zip(rows, batch):
+                existing = None
+                if upsert:
+                    existing = conn.execute(key_sql, [rec[i] for i in key_idx]).fetchone()
+                if existing:
+                    vals = [rec[i] for i in upd_idx]
+                    updates.append((rowno, vals + [existing[0]] + vals))
+                else:
+                    inserts.append((rowno, rec))
+            for sql, items, counter in [(ins_sql, inserts, "inserted"), (upd_sql, updates, "updated")]:
+                if not items:
+                    continue
+                conn.execute("SAVEPOINT batch;")
+                try:
+                    n = conn.executemany(sql, [params for _, params in items]).rowcount
+                    conn.execute("RELEASE batch;")
+                    result[counter] += n
+                    if counter == "updated":
+                        result["unchanged"] += len(items) - n
+                except sqlite3.DatabaseError:
+                    # κάποια γραμμή χάλασε το batch: ξανά μία-μία για να βρούμε ποια
+                    conn.execute("ROLLBACK TO batch;")
+                    conn.execute("RELEASE batch;")
+                    for rowno, params in items:
+                        try:
+                            n = conn.execute(sql, params).rowcount
+                            result[counter] += n
+                            if counter == "updated":
+                                result["unchanged"] += 1 - n
+                        except sqlite3.DatabaseError as e:
+                            failures.append((rowno, str(e)))
+    result["failed"] = len(failures)
+    result["errors"] = pd.concat([dup_report, pd.DataFrame(failures, columns=["row", "errors"])],
+                                 ignore_index=True)
+    return result
+
+def import_file(src, name=None, upsert=False, sheet=0, batch_size=IMPORT_BATCH_ROWS, dry_run=False):
+    # dry_run: μόνο επικύρωση, τίποτα δεν γράφεται στη βάση
+    clean, report, ignored = prepare(read_table(src, name, sheet))
+    if dry_run:
+        dup_report = drop_duplicates(clean)[1] if upsert else report.iloc[:0]
+        result = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0, "duplicates": len(dup_report),
+                  "errors": dup_report, "valid": len(clean)}
+    else:
+        result = import_frame(clean, upsert=upsert, batch_size=batch_size)
+        result["valid"] = len(clean)
+    result["rejected"] = len(report)
+    result["ignored_columns"] = ignored
+    result["errors"] = pd.concat([report, result["errors"]], ignore_index=True).sort_values("row")
+    return result
@@ -0,0 +1,187 @@
+# production/metrics.py — Μετρήσεις χρόνου, slow-query log και export για monitoring
+#
+# Κάθε μετρούμενο βήμα είναι ένα (kind, name): π.χ. ("sql", "fetch_rows"),
+# ("pandas", "fetch_rows"), ("connect", "get_conn"), ("render", "view"). Για το
+# καθένα κρατάμε πλήθος, συνολικό/μέγιστο χρόνο, γραμμές, bytes, histogram και τα
+# τελευταία δείγματα (για p50/p95). Οι μετρήσεις είναι ανά process, κοινές για όλα
+# τα sessions του Streamlit.
+#
+# Το module δεν κάνει import από το υπόλοιπο πακέτο στο επίπεδο του module, ώστε
+# να μπορεί να το χρησιμοποιεί και το connection.py.
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_ENABLED = os.environ.get("ARI_METRICS", "1") != "0"
+SLOW_QUERY_MS = float(os.environ.get("ARI_SLOW_QUERY_MS", 250))
+SLOW_QUERY_LOG = os.environ.get("ARI_SLOW_QUERY_LOG")    # αρχείο JSON lines (προαιρετικό)
+METRICS_FILE = os.environ.get("ARI_METRICS_FILE")        # *.prom -> Prometheus, αλλιώς JSON lines
+METRICS_FLUSH_S = 15
+RECENT_SAMPLES = 1024
+SLOW_KEEP = 50
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+log = logging.getLogger("production.slow")
+
+_stats = {}                     # (kind, name) -> dict
+_slow = deque(maxlen=SLOW_KEEP)
+_lock = threading.Lock()
+_last_flush = 0.0
+
+def _new_stat():
+    return {"count": 0, "errors": 0, "sum": 0.0, "max": 0.0, "rows": 0, "bytes": 0,
+            "buckets": [0] * len(BUCKETS), "recent": deque(maxlen=RECENT_SAMPLES)}
+
+def record(kind, name, seconds, rows=None, nbytes=None, error=False):
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        s = _stats.get((kind, name))
+        if s is None:
+            s = _stats[(kind, name)] = _new_stat()
+        s["count"] += 1
+        s["errors"] += bool(error)
+        s["sum"] += seconds
+        s["max"] = max(s["max"], seconds)
+        s["rows"] += rows or 0
+        s["bytes"] += nbytes or 0
+        s["recent"].append(seconds)
+        for i, le in enumerate(BUCKETS):
+            if seconds <= le:
+                s["buckets"][i] += 1
+                break
+
+@contextmanager
+def timed(kind, name, sql=None, params=()):
+    # with timed("sql", "fetch_rows", sql=q, params=p) as m: ... m["rows"] = len(rows)
+    # Με sql, ό,τι ξεπερνά το SLOW_QUERY_MS γράφεται στο slow-query log μαζί με το plan.
+    m = {}
+    if not METRICS_ENABLED:
+        yield m
+        return
+    error = False
+    t0 = time.perf_counter()
+    try:
+        yield m
+    except Exception:
+        # όχι BaseException: το st.rerun()/st.stop() περνούν από εδώ ως έλεγχος ροής, όχι ως σφάλμα
+        error = True
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        record(kind, name, dt, m.get("rows"), m.get("bytes"), error)
+        if sql is not None and dt * 1000 >= SLOW_QUERY_MS:
+            _slow_query(name, sql, params, dt, m.get("rows"))
+
+def _plan(sql, params):
+    # Ξεχωριστή, βραχύβια σύνδεση: το query μπορεί να έτρεξε μέσα σε συναλλαγή ή με
+    # όλο το pool δανεισμένο.
+    from .connection import get_conn
+    conn = get_conn()
+    try:
+        return [r[-1] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, tuple(params)).fetchall()]
+    except Exception as e:
+        return [f"(χωρίς plan: {e})"]
+    finally:
+        conn.close()
+
+def _slow_query(name, sql, params, seconds, rows):
+    entry = {"ts": time.time(), "name": name, "ms": round(seconds * 1000, 2), "rows": rows,
+             "sql": sql, "params": [str(p) for p in params], "plan": _plan(sql, params)}
+    with _lock:
+        _slow.append(entry)
+    log.warning("slow query %s: %.1f ms, %s γραμμές\n  %s\n  plan: %s",
+                name, entry["ms"], rows, sql, " | ".join(entry["plan"]))
+    if SLOW_QUERY_LOG:
+        with open(SLOW_QUERY_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+def _pct(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+def snapshot():
+    # Λίστα από dict, ταξινομημένη κατά συνολικό χρόνο (τα ακριβότερα πρώτα)
+    with _lock:
+        items = [(k, dict(s, recent=sorted(s["recent"]))) for k, s in _stats.items()]
+    out = []
+    for (kind, name), s in items:
+        out.append({"kind": kind, "name": name, "count": s["count"], "errors": s["errors"],
+                    "total_ms": round(s["sum"] * 1000, 2),
+                    "mean_ms": round(s["sum"] * 1000 / s["count"], 2),
+                    "p50_ms": round(_pct(s["recent"], 0.50) * 1000, 2),
+                    "p95_ms": round(_pct(s["recent"], 0.95) * 1000, 2),
+                    "max_ms": round(s["max"] * 1000, 2), "rows": s["rows"], "bytes": s["bytes"]})
+    return sorted(out, key=lambda r: r["total_ms"], reverse=True)
+
+def slow_queries():
+    with _lock:
+        return list(reversed(_slow))
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _slow.clear()
+
+# -------------- Export --------------
+def jsonl_lines():
+    ts = round(time.time(), 3)
+    return [json.dumps({"ts": ts, "pid": os.getpid(), **r}, ensure_ascii=False) for r in snapshot()]
+
+def _esc(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text():
+    from .cache import cache_stats
+    with _lock:
+        items = sorted((k, dict(s, buckets=list(s["buckets"]))) for k, s in _stats.items())
+    out = ["# HELP ari_op_duration_seconds Διάρκεια λειτουργιών (sql, pandas, connect, render, ...)",
+           "# TYPE ari_op_duration_seconds histogram"]
+    for (kind, name), s in items:
+        lbl = f'kind="{_esc(kind)}",name="{_esc(name)}"'
+        cum = 0
+        for le, n in zip(BUCKETS, s["buckets"]):
+            cum += n
+            out.append(f'ari_op_duration_seconds_bucket{{{lbl},le="{le}"}} {cum}')
+        out.append(f'ari_op_duration_seconds_bucket{{{lbl},le="+Inf"}} {s["count"]}')
+        out.append(f"ari_op_duration_seconds_sum{{{lbl}}} {s['sum']:.6f}")
+        out.append(f"ari_op_duration_seconds_count{{{lbl}}} {s['count']}")
+    for metric, field, help_ in (("ari_op_rows_total", "rows", "Γραμμές που διαβάστηκαν/γράφτηκαν"),
+                                 ("ari_op_bytes_total", "bytes", "Bytes αποτελεσμάτων"),
+                                 ("ari_op_errors_total", "errors", "Λειτουργίες που απέτυχαν")):
+        out += [f"# HELP {metric} {help_}", f"# TYPE {metric} counter"]
+        out += [f'{metric}{{kind="{_esc(k)}",name="{_esc(n)}"}} {s[field]}' for (k, n), s in items]
+    cs = cache_stats()
+    out += ["# TYPE ari_cache_entries gauge", f"ari_cache_entries {cs['entries']}",
+            "# TYPE ari_cache_bytes gauge", f"ari_cache_bytes {cs['bytes']}"]
+    return "\n".join(out) + "\n"
+
+def export(path=None):
+    # *.prom: ολόκληρο το αρχείο αντικαθίσταται ατομικά (textfile collector του node_exporter)·
+    # αλλιώς προστίθεται ένα snapshot σε JSON lines.
+    global _last_flush
+    path = path or METRICS_FILE
+    if not path:
+        return None
+    if str(path).endswith(".prom"):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, path)
+    else:
+        lines = jsonl_lines()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+    _last_flush = time.monotonic()
+    return path
+
+def maybe_export():
+    # καλείται στο τέλος κάθε rerun· γράφει το πολύ μία φορά ανά METRICS_FLUSH_S
+    if METRICS_FILE and time.monotonic() - _last_flush >= METRICS_FLUSH_S:
+        return export()
+    return None
@@ -0,0 +1,83 @@
+# production/models.py — Μοντέλο εγγραφής βάρδιας και κανόνες επικύρωσης
+import re
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+
+# Οι ίδιοι κανόνες για τη φόρμα και τη μαζική εισαγωγή (importer.py).
+SHIFT_RE = re.compile(r"^\d{1,2}:\d{2}$")      # HH:MM
+
+def validate_record(code, group_lines, shift_start, shift_end):
+    errors = []
+    if not str(code or "").strip(): errors.append("Κωδικός")
+    if not str(group_lines or "").strip().isdigit():
+        errors.append("group of lines (πρέπει να είναι αριθμός)")
+    for lbl, t in [("Shift Start", shift_start), ("Shift End", shift_end)]:
+        if not SHIFT_RE.match(str(t or "").strip()): errors.append(f"{lbl} (HH:MM)")
+    return errors
+
+@dataclass
+class ProductionRecord:
+    # Μία γραμμή του πίνακα production (ίδια σειρά με το CREATE TABLE)
+    rec_date: str                     # YYYY-MM-DD
+    line: int
+    group_lines: int
+    code: str                         # Κωδικός
+    shift_start: str                  # HH:MM
+    shift_end: str                    # HH:MM
+    filling_ws: Optional[int] = None
+    catering: Optional[float] = None
+    code_tmx1: Optional[float] = 0
+    code_tmx2: Optional[float] = 0
+    code_tmx3: Optional[float] = 0
+    code_tmx4: Optional[float] = 0
+    code_tmx5: Optional[float] = 0
+    code_tmx6: Optional[float] = 0
+    control: Optional[int] = None
+    weighting: Optional[float] = None
+    packaging: Optional[float] = None
+    control_in_pack: Optional[int] = None
+    produced_pcs: Optional[int] = None
+    reworked_pcs: Optional[int] = None
+    wrong_weight_reworked: Optional[int] = None
+    destroyed: Optional[int] = None
+    red_pepper: float = 0
+    green_pepper: float = 0
+    red_cherry_pepper: float = 0
+    snack_pepper: float = 0
+    yellow_cherry_pepper: float = 0
+    jalapeno: float = 0
+    stuffed_olives: float = 0
+    l1: int = 0; l2: int = 0; l3: int = 0; l4: int = 0; l5: int = 0; l6: int = 0
+    l7: int = 0; l8: int = 0; l9: int = 0; l10: int = 0; l11: int = 0; l12: int = 0
+    l13: int = 0; l14: int = 0; l15: int = 0; l16: int = 0; l17: int = 0; l18: int = 0
+    l19: int = 0; l20: int = 0; l21: int = 0; l22: int = 0; l23: int = 0; l24: int = 0
+    l25: int = 0; l26: int = 0; l27: int = 0
+    l3_comment: Optional[str] = None
+    l8_comment: Optional[str] = None
+    l24_comment: Optional[str] = None
+    l25_comment: Optional[str] = None
+    id: Optional[int] = None
+    version: int = 1                  # αυξάνεται σε κάθε UPDATE (optimistic concurrency)
+    updated_at: Optional[str] = None  # UTC, YYYY-MM-DD HH:MM:SS της τελευταίας αλλαγής
+
+    @classmethod
+    def from_row(cls, row):
+        # dict από τη βάση -> εγγραφή· αγνοεί στήλες που δεν ανήκουν στο μοντέλο
+        return cls(**{k: row[k] for k in COLUMNS if k in row})
+
+    def validate(self):
+        return validate_record(self.code, self.group_lines, self.shift_start, self.shift_end)
+
+    def to_payload(self):
+        # για insert_row/update_row: όλα τα πεδία εκτός από id/version/updated_at
+        d = asdict(self)
+        for k in META_COLUMNS:
+            d.pop(k)
+        return d
+
+COLUMNS = tuple(f.name for f in fields(ProductionRecord))
+META_COLUMNS = ("id", "version", "updated_at")     # τις διαχειρίζεται η βάση, όχι η φόρμα
+ERROR_COLUMNS = tuple(f"l{i}" for i in range(1, 28))
+PRODUCT_COLUMNS = ("red_pepper", "green_pepper", "red_cherry_pepper", "snack_pepper",
+                   "yellow_cherry_pepper", "jalapeno", "stuffed_olives")
+COMMENT_COLUMNS = ("l3_comment", "l8_comment", "l24_comment", "l25_comment")
@@ -0,0 +1,58 @@
+# production/plans.py — Έλεγχος ότι τα βασικά queries πιάνουν index (EXPLAIN QUERY PLAN)
+from .fts import _match_query, _search_page_query
+from .queries import ORDER_BY, _page_query, _search_where, _where, query_plan
+from .schema import init_db
+
+# Αντιπροσωπευτικοί συνδυασμοί φίλτρων· κανένας δεν πρέπει να κάνει full scan
+# του production ή ταξινόμηση σε temp b-tree.
+PLAN_CHECKS = {
+    "date range": dict(date_from="2024-01-01", date_to="2024-12-31"),
+    "date from": dict(date_from="2024-01-01"),
+    "date to": dict(date_to="2024-12-31"),
+    "line": dict(line=1),
+    "line + date range": dict(date_from="2024-01-01", date_to="2024-12-31", line=1),
+}
+
+SEARCH_CHECKS = ["#12", "L3", "2024-05", "17/05/2024", "1825", "L3 1825"]
+
+# Αναζήτηση κειμένου: το MATCH πρέπει να περνά από το ευρετήριο FTS5 και το production
+# να διαβάζεται μόνο με id (η ταξινόμηση κατά bm25 γίνεται αναγκαστικά στα ευρήματα).
+FTS_CHECKS = {
+    "text": dict(text="σπασμένο"),
+    "text + line + date": dict(text="1825 ετικέτα", date_from="2024-01-01", line=1),
+}
+
+def _plan_problems(label, sql, params, table="production", allow_sort=False):
+    # Με φίλτρο ημερομηνίας/γραμμής ο πίνακας πρέπει να διαβάζεται με SEARCH. Κάθε SCAN
+    # απορρίπτεται, και με index: π.χ. το date(rec_date) >= ? δίνει "SCAN production
+    # USING INDEX idx_prod_date", δηλαδή σάρωση ολόκληρου του index.
+    plan = query_plan(sql, params)
+    problems = [f"{label}: {step}  [{sql}]" for step in plan
+                if step.startswith(f"SCAN {table} ") or step == f"SCAN {table}"
+                or (not allow_sort and "TEMP B-TREE" in step)]
+    if not any(step.startswith(f"SEARCH {table} ") for step in plan):
+        problems.append(f"{label}: χωρίς SEARCH στο {table}  [{sql}]")
+    return problems
+
+def check_query_plans():
+    init_db()
+    problems = []
+    for name, filters in PLAN_CHECKS.items():
+        where, p = _where(**filters)
+        sqls = [("SELECT * FROM production" + where + ORDER_BY, p),
+                _page_query(page_size=50, after=("2024-06-30", 1), **filters),
+                ("SELECT COUNT(*) FROM production" + where, p)]
+        for sql, params in sqls:
+            problems += _plan_problems(name, sql, params)
+    # στην αναζήτηση επιτρέπεται ταξινόμηση των (λίγων) αποτελεσμάτων, όχι σάρωση
+    for text in SEARCH_CHECKS:
+        where, p = _search_where(text)
+        problems += _plan_problems(f"search {text!r}", "SELECT id FROM production" + where + ORDER_BY, p,
+                                   allow_sort=True)
+    for name, args in FTS_CHECKS.items():
+        for sql, params in (_search_page_query(**args, after=(-1.0, 1)), _match_query("COUNT(*)", **args)):
+            plan = query_plan(sql, params)
+            if not any("VIRTUAL TABLE INDEX" in step for step in plan):
+                problems.append(f"fts {name}: χωρίς MATCH στο ευρετήριο  [{sql}]")
+            problems += _plan_problems(f"fts {name}", sql, params, table="p", allow_sort=True)
+    return problems
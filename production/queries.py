@@ -0,0 +1,192 @@
+# production/queries.py — Αναγνώσεις: φίλτρα, σελιδοποίηση, αναζήτηση εγγραφής
+#
+# Τα DataFrame χρειάζονται pandas· το import γίνεται μέσα στις συναρτήσεις, ώστε το
+# πακέτο να φορτώνει γρήγορα σε εργασίες που δεν το χρειάζονται.
+import heapq
+import re
+from datetime import date, datetime
+from itertools import islice
+
+from . import metrics
+from .cache import cached
+from .connection import read_conn
+
+ORDER_BY = " ORDER BY rec_date DESC, id DESC"
+
+def _iso_date(v):
+    # date/datetime/"YYYY-MM-DD..." -> "YYYY-MM-DD", ώστε η σύγκριση κειμένου να είναι σωστή
+    if isinstance(v, datetime):
+        v = v.date()
+    if isinstance(v, date):
+        return v.isoformat()
+    return date.fromisoformat(str(v).strip()[:10]).isoformat()
+
+def _where(date_from=None, date_to=None, line=None):
+    # Μόνο γυμνές στήλες στα φίλτρα: καμία συνάρτηση πάνω στο rec_date/line.
+    q = " WHERE 1=1"
+    p = []
+    if date_from:
+        q += " AND rec_date >= ?"; p.append(_iso_date(date_from))
+    if date_to:
+        q += " AND rec_date <= ?"; p.append(_iso_date(date_to))
+    if line is not None and str(line).strip() != "":
+        q += " AND line = ?"; p.append(int(line))
+    return q, p
+
+def _fetch(conn, name, q, p):
+    with metrics.timed("sql", name, sql=q, params=p) as m:
+        cur = conn.execute(q, p)
+        rows = cur.fetchall()
+        m["rows"] = len(rows)
+    return [d[0] for d in cur.description], rows
+
+def _frame(name, cols, rows):
+    import pandas as pd
+    with metrics.timed("pandas", name) as m:
+        df = pd.DataFrame.from_records(rows, columns=cols, coerce_float=True)
+        m["rows"] = len(df)
+    return df
+
+def _read_frame(name, q, p):
+    # SELECT -> DataFrame, με ξεχωριστή μέτρηση για την SQLite και για το pandas
+    with read_conn() as conn:
+        cols, rows = _fetch(conn, name, q, p)
+    return _frame(name, cols, rows)
+
+def merge_sorted(cols, parts):
+    # Κάθε πηγή (ζωντανή βάση, αρχεία ετών) επιστρέφει ήδη ταξινομημένα κατά ORDER_BY·
+    # τα συγχωνεύουμε χωρίς νέα ταξινόμηση (οι εγγραφές με αναδρομική ημερομηνία μένουν
+    # στη ζωντανή βάση ως την επόμενη αρχειοθέτηση, οπότε δεν αρκεί η απλή σειρά πηγών).
+    if len(parts) == 1:
+        return parts[0]
+    i, j = cols.index("rec_date"), cols.index("id")
+    return heapq.merge(*parts, key=lambda r: (r[i], r[j]), reverse=True)
+
+def _read_sources(name, date_from, date_to, query, limit=None):
+    # query(src) -> (sql, params) για κάθε πηγή του archive.sources()
+    from .archive import sources
+    with sources(date_from, date_to) as srcs:
+        parts = [_fetch(s.conn, name, *query(s)) for s in srcs]
+    cols = parts[0][0]
+    rows = merge_sorted(cols, [r for _, r in parts])
+    return _frame(name, cols, list(islice(rows, limit)))
+
+def _source_query(src, select, where, p, tail="", tail_p=()):
+    # το ίδιο SELECT για μία πηγή: "*" -> οι στήλες της ζωντανής βάσης, + φίλτρο through
+    q = f"SELECT {src.select if select == '*' else select} FROM production" + where + src.clamp + tail
+    return q, list(p) + src.params + list(tail_p)
+
+@cached
+def fetch_rows(date_from=None, date_to=None, line=None):
+    where, p = _where(date_from, date_to, line)
+    return _read_sources("fetch_rows", date_from, date_to,
+                         lambda s: _source_query(s, "*", where, p, ORDER_BY))
+
+def _page_where(date_from=None, date_to=None, line=None, after=None):
+    where, p = _where(date_from, date_to, line)
+    if after is not None:
+        where += " AND (rec_date, id) < (?, ?)"; p += [after[0], int(after[1])]
+    return where, p
+
+def _page_query(date_from=None, date_to=None, line=None, page_size=50, after=None):
+    where, p = _page_where(date_from, date_to, line, after)
+    # +1 γραμμή για να ξέρουμε αν υπάρχει επόμενη σελίδα
+    return "SELECT * FROM production" + where + ORDER_BY + " LIMIT ?", p + [int(page_size) + 1]
+
+@cached
+def fetch_page(date_from=None, date_to=None, line=None, page_size=50, after=None):
+    # Keyset pagination: after = (rec_date, id) της τελευταίας γραμμής της προηγούμενης
+    # σελίδας. Το (rec_date, id) < (?, ?) συνεχίζει τη σάρωση του index από εκεί που
+    # σταμάτησε, χωρίς OFFSET, οπότε κάθε σελίδα κοστίζει το ίδιο όσο βαθιά κι αν είναι.
+    # Επιστρέφει (df, next_cursor)· next_cursor = None στην τελευταία σελίδα.
+    # Με αρχειοθετημένα έτη κάθε πηγή δίνει έως page_size+1 γραμμές και κρατάμε τις
+    # πρώτες page_size+1 της συγχώνευσης.
+    where, p = _page_where(date_from, date_to, line, after)
+    n = int(page_size) + 1
+    df = _read_sources("fetch_page", date_from, after[0] if after is not None else date_to,
+                       lambda s: _source_query(s, "*", where, p, ORDER_BY + " LIMIT ?", [n]), limit=n)
+    if len(df) <= page_size:
+        return df, None
+    df = df.iloc[:page_size]
+    last = df.iloc[-1]
+    return df, (str(last["rec_date"]), int(last["id"]))
+
+@cached
+def count_rows(date_from=None, date_to=None, line=None):
+    from .archive import sources
+    where, p = _where(date_from, date_to, line)
+    n = 0
+    with sources(date_from, date_to) as srcs:
+        for s in srcs:
+            _cols, rows = _fetch(s.conn, "count_rows", *_source_query(s, "COUNT(*)", where, p))
+            n += rows[0][0]
+    return n
+
+@cached
+def get_row(id_):
+    q = "SELECT * FROM production WHERE id=?"
+    with read_conn() as conn, metrics.timed("sql", "get_row", sql=q, params=(int(id_),)) as m:
+        cur = conn.execute(q, (int(id_),))
+        row = cur.fetchone()
+        m["rows"] = int(row is not None)
+        return None if row is None else dict(zip([d[0] for d in cur.description], row))
+
+def get_record(id_):
+    from .models import ProductionRecord
+    row = get_row(id_)
+    return None if row is None else ProductionRecord.from_row(row)
+
+# -------------- Αναζήτηση εγγραφών (picker) --------------
+LABEL_SQL = ("'#' || id || ' | ' || rec_date || ' | L' || line || ' | ' || code"
+             " || ' | pcs=' || IFNULL(produced_pcs, '')")
+
+_RE_ID = re.compile(r"#(\d+)$")
+_RE_LINE = re.compile(r"[lL](\d+)$")
+_RE_ISO = re.compile(r"\d{4}-\d{2}(-\d{2})?$")
+_RE_DMY = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})$")
+
+def _prefix_range(prefix):
+    # "abc" -> ("abc", "abd"): το col >= ? AND col < ? πιάνει index, σε αντίθεση με το LIKE
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _dmy(m):
+    d, mth, y = (int(x) for x in m.groups())
+    try:
+        return date(y, mth, d).isoformat()
+    except ValueError:
+        return None
+
+def _search_where(text):
+    # Κάθε λέξη γίνεται ένα φίλτρο (AND):
+    #   #123 -> id,  L3 -> line,  2024-05 / 2024-05-17 / 17/05/2024 -> ημερομηνία,
+    #   οτιδήποτε άλλο -> πρόθεμα κωδικού
+    q, p = " WHERE 1=1", []
+    for tok in str(text or "").split():
+        if m := _RE_ID.match(tok):
+            q += " AND id = ?"; p.append(int(m.group(1)))
+        elif m := _RE_LINE.match(tok):
+            q += " AND line = ?"; p.append(int(m.group(1)))
+        elif _RE_ISO.match(tok):
+            q += " AND rec_date >= ? AND rec_date < ?"; p += _prefix_range(tok)
+        elif (m := _RE_DMY.match(tok)) and (d := _dmy(m)):
+            q += " AND rec_date = ?"; p.append(d)
+        else:
+            q += " AND code >= ? AND code < ?"; p += _prefix_range(tok)
+    return q, p
+
+@cached
+def search_records(text="", limit=200):
+    # Επιστρέφει {id: label}, με τις ετικέτες φτιαγμένες μέσα στην SQLite.
+    where, p = _search_where(text)
+    q = f"SELECT id, {LABEL_SQL} FROM production" + where + ORDER_BY + " LIMIT ?"
+    p = p + [int(limit)]
+    with read_conn() as conn, metrics.timed("sql", "search_records", sql=q, params=p) as m:
+        rows = conn.execute(q, p).fetchall()
+        m["rows"] = len(rows)
+    return dict(rows)
+
+def query_plan(sql, params=(), conn=None):
+    if conn is None:
+        with read_conn() as conn:
+            return query_plan(sql, params, conn)
+    return [r[-1] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
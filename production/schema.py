@@ -0,0 +1,148 @@
+# production/schema.py — Σχήμα βάσης και migrations
+import sqlite3
+import threading
+
+from . import connection
+from .archive import ARCHIVE_GUARD, archive_ddl
+from .audit import (audit_archive_trigger, audit_ddl, audit_del_trigger, audit_ins_trigger,
+                    audit_triggers)
+from .fts import fts_ddl, fts_rebuild_sql, fts_triggers
+from .summary import summary_ddl, summary_del_trigger, summary_rebuild_sql, summary_triggers
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS production (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rec_date   TEXT NOT NULL,         -- YYYY-MM-DD
+    line       INTEGER NOT NULL,
+    group_lines INTEGER NOT NULL,
+    code       TEXT NOT NULL,         -- Κωδικός
+    shift_start TEXT NOT NULL,        -- HH:MM
+    shift_end   TEXT NOT NULL,        -- HH:MM
+    filling_ws  INTEGER,              -- Filling WS
+    catering    REAL,                 -- Catering (π.χ. 1.5, 2)
+
+    code_tmx1   REAL DEFAULT 0,
+    code_tmx2   REAL DEFAULT 0,
+    code_tmx3   REAL DEFAULT 0,
+    code_tmx4   REAL DEFAULT 0,
+    code_tmx5   REAL DEFAULT 0,
+    code_tmx6   REAL DEFAULT 0,
+
+    control     INTEGER,              -- Control
+    weighting   REAL,                 -- Weighting
+    packaging   REAL,                 -- Packaging
+    control_in_pack INTEGER,         -- Control in Packaging
+    produced_pcs INTEGER,            -- Produced Pcs
+    reworked_pcs INTEGER,            -- Reworked pcs
+    wrong_weight_reworked INTEGER,   -- Wrong Weight (Reworked Pcs)
+    destroyed   INTEGER,
+
+    -- ΝΕΑ ΠΕΔΙΑ (από screenshots)
+    red_pepper   REAL DEFAULT 0,
+    green_pepper REAL DEFAULT 0,
+    red_cherry_pepper REAL DEFAULT 0,
+    snack_pepper REAL DEFAULT 0,
+    yellow_cherry_pepper REAL DEFAULT 0,
+    jalapeno REAL DEFAULT 0,
+    stuffed_olives REAL DEFAULT 0,
+
+    -- L1..L27 (ακέραια)
+    l1  INTEGER DEFAULT 0,  l2  INTEGER DEFAULT 0,  l3  INTEGER DEFAULT 0,
+    l4  INTEGER DEFAULT 0,  l5  INTEGER DEFAULT 0,  l6  INTEGER DEFAULT 0,
+    l7  INTEGER DEFAULT 0,  l8  INTEGER DEFAULT 0,  l9  INTEGER DEFAULT 0,
+    l10 INTEGER DEFAULT 0,  l11 INTEGER DEFAULT 0,  l12 INTEGER DEFAULT 0,
+    l13 INTEGER DEFAULT 0,  l14 INTEGER DEFAULT 0,  l15 INTEGER DEFAULT 0,
+    l16 INTEGER DEFAULT 0,  l17 INTEGER DEFAULT 0,  l18 INTEGER DEFAULT 0,
+    l19 INTEGER DEFAULT 0,  l20 INTEGER DEFAULT 0,  l21 INTEGER DEFAULT 0,
+    l22 INTEGER DEFAULT 0,  l23 INTEGER DEFAULT 0,  l24 INTEGER DEFAULT 0,
+    l25 INTEGER DEFAULT 0,  l26 INTEGER DEFAULT 0,  l27 INTEGER DEFAULT 0,
+
+    -- Comments
+    l3_comment  TEXT,
+    l8_comment  TEXT,
+    l24_comment TEXT,
+    l25_comment TEXT
+);
+"""
+
+# Κάθε migration τρέχει μία φορά· η τρέχουσα έκδοση κρατιέται στο PRAGMA user_version.
+MIGRATIONS = [
+    # 1: sargable φίλτρα ημερομηνίας/γραμμής.
+    # Οι ημερομηνίες αποθηκεύονται πάντα ως YYYY-MM-DD, ώστε η σύγκριση κειμένου
+    # rec_date >= ? να είναι ισοδύναμη με date(rec_date) >= date(?) και να πιάνει index.
+    # Κάθε index της SQLite έχει σιωπηρά το rowid (id) στο τέλος: το idx_prod_date
+    # είναι ουσιαστικά (rec_date, id) και το idx_prod_line_date (line, rec_date, id),
+    # οπότε και το ORDER BY rec_date DESC, id DESC εξυπηρετείται χωρίς ταξινόμηση.
+    """
+    UPDATE production SET rec_date = date(rec_date)
+     WHERE date(rec_date) IS NOT NULL AND rec_date <> date(rec_date);
+    DROP INDEX IF EXISTS idx_prod_line;
+    CREATE INDEX IF NOT EXISTS idx_prod_date ON production(rec_date);
+    CREATE INDEX IF NOT EXISTS idx_prod_line_date ON production(line, rec_date);
+    ANALYZE;
+    """,
+    # 2: αναζήτηση εγγραφής με πρόθεμα κωδικού (picker επεξεργασίας)
+    """
+    CREATE INDEX IF NOT EXISTS idx_prod_code ON production(code, rec_date);
+    """,
+    # 3: πίνακας σύνοψης για τα KPI, triggers και αρχικό γέμισμα από τα υπάρχοντα δεδομένα
+    summary_ddl() + summary_triggers() + "DELETE FROM daily_summary;" + summary_rebuild_sql(),
+    # 4: ευρετήριο FTS5 για κωδικό και σχόλια, triggers και αρχικό γέμισμα
+    fts_ddl() + fts_triggers() + fts_rebuild_sql(),
+    # 5: optimistic concurrency. Το crud.update_row αυξάνει μόνο του το version· το trigger
+    # καλύπτει όσους γράφουν χωρίς αυτό (εξωτερικά εργαλεία), ώστε μια αλλαγή να μη
+    # περνά ποτέ απαρατήρητη. Δεν ξαναπυροδοτεί τα triggers σύνοψης/FTS (άλλες στήλες).
+    """
+    ALTER TABLE production ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+    ALTER TABLE production ADD COLUMN updated_at TEXT;
+    CREATE TRIGGER IF NOT EXISTS trg_prod_version AFTER UPDATE ON production
+    WHEN NEW.version = OLD.version BEGIN
+        UPDATE production SET version = OLD.version + 1, updated_at = datetime('now')
+         WHERE id = NEW.id;
+    END;
+    """,
+    # 6: audit log (μόνο οι αλλαγμένες στήλες, στην ίδια συναλλαγή με την αλλαγή)
+    audit_ddl() + audit_triggers(),
+    # 7: αρχειοθέτηση ετών (archive.py). Η μεταφορά στο αρχείο δεν αφαιρεί από τη σύνοψη
+    # και γράφει στο audit γεγονός "A" αντί για στιγμιότυπο διαγραφής.
+    archive_ddl() + """
+    DROP TRIGGER IF EXISTS trg_sum_del;
+    DROP TRIGGER IF EXISTS trg_audit_del;
+    """ + summary_del_trigger(ARCHIVE_GUARD) + audit_del_trigger(ARCHIVE_GUARD)
+    + audit_archive_trigger(f"NOT {ARCHIVE_GUARD}"),
+    # 8: τα στιγμιότυπα I/D του audit γράφουν ρητά null σε στήλες με default 0 (πριν
+    # παραλείπονταν και το record_at τα ανακατασκεύαζε ως 0)
+    """
+    DROP TRIGGER IF EXISTS trg_audit_ins;
+    DROP TRIGGER IF EXISTS trg_audit_del;
+    """ + audit_ins_trigger() + audit_del_trigger(ARCHIVE_GUARD),
+]
+
+def run_script(conn, script):
+    # εντολή-εντολή· τα triggers έχουν ";" μέσα στο BEGIN ... END
+    buf = ""
+    for part in script.split(";"):
+        buf += part + ";"
+        if sqlite3.complete_statement(buf):
+            if buf.strip(" \n;"):
+                conn.execute(buf)
+            buf = ""
+
+_initialized = set()        # βάσεις (DB_PATH) που έχουν ήδη ελεγχθεί σε αυτό το process
+_init_lock = threading.Lock()
+
+def init_db():
+    # Μία φορά ανά process και βάση· οι επόμενες κλήσεις (κάθε rerun) επιστρέφουν αμέσως.
+    path = connection.DB_PATH
+    if path in _initialized:
+        return
+    with _init_lock:
+        if path in _initialized:
+            return
+        with connection.write_conn() as conn:
+            run_script(conn, SCHEMA_SQL)
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+            for n, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                run_script(conn, script)
+                conn.execute(f"PRAGMA user_version = {n};")
+        _initialized.add(path)
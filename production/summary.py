@@ -0,0 +1,108 @@
+# production/summary.py — Σύνοψη ανά ημέρα × γραμμή × κωδικό (KPI)
+#
+# Ο daily_summary ενημερώνεται από triggers σε κάθε INSERT/UPDATE/DELETE του production
+# (άρα και από τη μαζική εισαγωγή ή εξωτερικά εργαλεία), ώστε οι αναφορές να διαβάζουν
+# μία γραμμή ανά ημέρα/γραμμή/κωδικό αντί για όλες τις βάρδιες.
+from .cache import cached
+from .connection import read_conn, write_conn
+from .models import ERROR_COLUMNS, PRODUCT_COLUMNS
+from .queries import _where
+
+SUMMARY_KEY = ("rec_date", "line", "code")
+SUMMARY_COLS = (["produced_pcs", "reworked_pcs", "wrong_weight_reworked", "destroyed"]
+                + list(PRODUCT_COLUMNS) + list(ERROR_COLUMNS))
+
+def summary_ddl():
+    cols = ",\n    ".join(f"{c} {'REAL' if c in PRODUCT_COLUMNS else 'INTEGER'} NOT NULL DEFAULT 0"
+                          for c in SUMMARY_COLS)
+    return f"""
+    CREATE TABLE IF NOT EXISTS daily_summary (
+        rec_date  TEXT NOT NULL,
+        line      INTEGER NOT NULL,
+        code      TEXT NOT NULL,
+        n_records INTEGER NOT NULL DEFAULT 0,
+        {cols},
+        PRIMARY KEY (rec_date, line, code)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_sum_line_date ON daily_summary(line, rec_date);
+    """
+
+def _summary_add(ref):
+    # πρόσθεση της γραμμής NEW στη σύνοψη (upsert)
+    names = ", ".join(SUMMARY_KEY + ("n_records",) + tuple(SUMMARY_COLS))
+    vals = ", ".join([f"{ref}.{k}" for k in SUMMARY_KEY] + ["1"]
+                     + [f"IFNULL({ref}.{c}, 0)" for c in SUMMARY_COLS])
+    sets = ", ".join(["n_records = n_records + 1"] + [f"{c} = {c} + excluded.{c}" for c in SUMMARY_COLS])
+    return (f"INSERT INTO daily_summary ({names}) VALUES ({vals})"
+            f" ON CONFLICT(rec_date, line, code) DO UPDATE SET {sets};")
+
+def _summary_sub(ref):
+    # αφαίρεση της γραμμής OLD· η γραμμή της σύνοψης σβήνεται όταν αδειάσει
+    sets = ", ".join(["n_records = n_records - 1"] + [f"{c} = {c} - IFNULL({ref}.{c}, 0)" for c in SUMMARY_COLS])
+    key = " AND ".join(f"{k} = {ref}.{k}" for k in SUMMARY_KEY)
+    return (f"UPDATE daily_summary SET {sets} WHERE {key};"
+            f" DELETE FROM daily_summary WHERE {key} AND n_records <= 0;")
+
+def summary_del_trigger(when=""):
+    # when: προαιρετική συνθήκη (η αρχειοθέτηση κρατά τα σύνολα των ετών που μεταφέρει)
+    cond = f"\n    WHEN {when}" if when else ""
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sum_del AFTER DELETE ON production{cond} BEGIN
+        {_summary_sub("OLD")}
+    END;
+    """
+
+def summary_triggers():
+    watched = ", ".join(SUMMARY_KEY + tuple(SUMMARY_COLS))
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS trg_sum_ins AFTER INSERT ON production BEGIN
+        {_summary_add("NEW")}
+    END;
+    {summary_del_trigger()}
+    CREATE TRIGGER IF NOT EXISTS trg_sum_upd AFTER UPDATE OF {watched} ON production BEGIN
+        {_summary_sub("OLD")}
+        {_summary_add("NEW")}
+    END;
+    """
+
+def summary_select_sql(where=""):
+    sums = ", ".join(f"SUM(IFNULL({c}, 0))" for c in SUMMARY_COLS)
+    return (f"SELECT rec_date, line, code, COUNT(*), {sums} FROM production{where}"
+            f" GROUP BY rec_date, line, code")
+
+def summary_rebuild_sql(where=""):
+    names = ", ".join(SUMMARY_KEY + ("n_records",) + tuple(SUMMARY_COLS))
+    return f"INSERT INTO daily_summary ({names}) {summary_select_sql(where)};"
+
+def summary_merge_sql():
+    # μία γραμμή σύνοψης (με παραμέτρους) που προστίθεται σε ό,τι υπάρχει ήδη
+    names = SUMMARY_KEY + ("n_records",) + tuple(SUMMARY_COLS)
+    sets = ", ".join(f"{c} = {c} + excluded.{c}" for c in names[len(SUMMARY_KEY):])
+    return (f"INSERT INTO daily_summary ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+            f" ON CONFLICT(rec_date, line, code) DO UPDATE SET {sets};")
+
+def rebuild_summary():
+    # Πλήρες ξαναχτίσιμο (π.χ. μετά από χειροκίνητες αλλαγές με triggers απενεργοποιημένα),
+    # μαζί με τα αρχειοθετημένα έτη
+    from .archive import archived_summary
+    from .schema import init_db     # schema -> summary για τα triggers της migration 3
+    init_db()
+    archived = archived_summary()
+    with write_conn() as conn:
+        conn.execute("DELETE FROM daily_summary;")
+        conn.execute(summary_rebuild_sql())
+        conn.executemany(summary_merge_sql(), archived)
+        return conn.execute("SELECT COUNT(*) FROM daily_summary;").fetchone()[0]
+
+@cached
+def fetch_kpis(date_from=None, date_to=None, line=None, by=("rec_date",)):
+    # Άθροισμα του daily_summary ανά by (υποσύνολο του (rec_date, line, code))
+    import pandas as pd
+    by = tuple(c for c in by if c in SUMMARY_KEY)
+    where, p = _where(date_from, date_to, line)
+    sums = ", ".join(f"SUM({c}) AS {c}" for c in ("n_records",) + tuple(SUMMARY_COLS))
+    q = f"SELECT {', '.join(by + (sums,))} FROM daily_summary{where}"
+    if by:
+        q += f" GROUP BY {', '.join(by)} ORDER BY {', '.join(by)}"
+    with read_conn() as conn:
+        return pd.read_sql_query(q, conn, params=p)
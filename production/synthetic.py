@@ -0,0 +1,94 @@
+# production/synthetic.py — Συνθετικές βάρδιες για δοκιμές φόρτου και benchmarks
+#
+# Ρεαλιστική κατανομή: οι εγγραφές μοιράζονται ομοιόμορφα στις εργάσιμες ημέρες των
+# τελευταίων SYNTHETIC_YEARS ετών έως σήμερα (όσο περισσότερες, τόσο πυκνότερες οι
+# βάρδιες/κωδικοί ανά γραμμή και ημέρα), με κωδικό από ένα περιορισμένο σύνολο· τα
+# L1-L27 είναι αραιά (τα περισσότερα 0) και τα σχόλια L3/L8/L24/L25 εμφανίζονται
+# σπάνια. Οι γραμμές γράφονται με executemany σε μεγάλες συναλλαγές, όπως στη μαζική
+# εισαγωγή.
+import random
+from datetime import date, timedelta
+
+from .connection import write_conn
+from .models import COLUMNS, ERROR_COLUMNS, META_COLUMNS, PRODUCT_COLUMNS
+from .schema import init_db
+
+SHIFTS = [("06:00", "14:00"), ("07:30", "15:30"), ("14:00", "22:00"), ("22:00", "06:00")]
+COMMENTS = {
+    "l3_comment": ["σπασμένο καπάκι", "λάθος ετικέτα", "στραβή ετικέτα", "διαρροή άλμης"],
+    "l8_comment": ["χαμηλό βάρος", "υψηλό βάρος", "κενό βάζο", "ξένο σώμα"],
+    "l24_comment": ["καθυστέρηση υλικού", "βλάβη ζυγού", "αλλαγή κωδικού", "καθαρισμός"],
+    "l25_comment": ["έλεγχος ποιότητας", "αναμονή συσκευασίας", "βλάβη μεταφορικής"],
+}
+INSERT_COLS = [c for c in COLUMNS if c not in META_COLUMNS]
+SYNTHETIC_YEARS = 5
+
+def synthetic_span(start=None, end=None, years=SYNTHETIC_YEARS):
+    # (start, end) των συνθετικών δεδομένων· προεπιλογή: τα τελευταία `years` έτη έως σήμερα
+    end = end or date.today()
+    return start or date(end.year - years, end.month, 1), end
+
+def synthetic_rows(n, lines=12, codes=400, start=None, seed=0, end=None, years=SYNTHETIC_YEARS):
+    # Γεννήτρια n γραμμών (tuple με τη σειρά του INSERT_COLS) στο synthetic_span(), σε
+    # χρονολογική σειρά
+    rnd = random.Random(seed)
+    code_pool = [str(180000 + rnd.randrange(20000)) for _ in range(codes)]
+    # λίγοι κωδικοί τρέχουν πολύ συχνά (κατανομή Zipf-like)
+    weights = [1 / (i + 1) for i in range(codes)]
+    start, end = synthetic_span(start, end, years)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    days = [d for d in days if d.weekday() < 6] or [end]      # Κυριακή χωρίς παραγωγή
+    for i, day in enumerate(days):
+        # n * (i+1) // len(days) - n * i // len(days): ακριβώς n συνολικά
+        per_day = n * (i + 1) // len(days) - n * i // len(days)
+        order = rnd.sample(range(1, lines + 1), lines)
+        for j in range(per_day):
+            # γύρος στις γραμμές, μετά στις βάρδιες· πάνω από lines × βάρδιες, αλλαγές κωδικού
+            line = order[j % lines]
+            s_start, s_end = SHIFTS[(j // lines) % len(SHIFTS)]
+            yield _row(rnd, day, line, s_start, s_end, rnd.choices(code_pool, weights)[0])
+
+def _row(rnd, day, line, s_start, s_end, code):
+    pcs = rnd.randint(2000, 12000)
+    reworked = int(pcs * rnd.uniform(0, 0.04))
+    rec = {
+        "rec_date": day.isoformat(), "line": line, "group_lines": (line - 1) // 4 + 1,
+        "code": code, "shift_start": s_start, "shift_end": s_end,
+        "filling_ws": rnd.randint(2, 8), "catering": rnd.choice([0, 0.5, 1, 1.5, 2]),
+        "control": rnd.randint(0, 3), "weighting": round(rnd.uniform(0, 2), 1),
+        "packaging": round(rnd.uniform(0, 3), 1), "control_in_pack": rnd.randint(0, 2),
+        "produced_pcs": pcs, "reworked_pcs": reworked,
+        "wrong_weight_reworked": int(reworked * rnd.uniform(0, 0.5)),
+        "destroyed": int(pcs * rnd.uniform(0, 0.01)),
+    }
+    for i in range(1, 7):
+        rec[f"code_tmx{i}"] = 0
+    # κάθε βάρδια έχει 1-2 προϊόντα
+    for c in PRODUCT_COLUMNS:
+        rec[c] = 0
+    for c in rnd.sample(PRODUCT_COLUMNS, rnd.randint(1, 2)):
+        rec[c] = round(rnd.uniform(50, 800), 1)
+    # αραιά σφάλματα: ~15% πιθανότητα ανά L
+    for c in ERROR_COLUMNS:
+        rec[c] = rnd.randint(1, 30) if rnd.random() < 0.15 else 0
+    for c, texts in COMMENTS.items():
+        rec[c] = rnd.choice(texts) if rnd.random() < 0.05 else None
+    return tuple(rec.get(c) for c in INSERT_COLS)
+
+def generate(n, lines=12, codes=400, start=None, seed=0, batch_size=20000, progress=None,
+             end=None, years=SYNTHETIC_YEARS):
+    # Γράφει n συνθετικές βάρδιες στη βάση (DB_PATH)· επιστρέφει το πλήθος.
+    init_db()
+    sql = f"INSERT INTO production ({','.join(INSERT_COLS)}) VALUES ({','.join('?' * len(INSERT_COLS))})"
+    rows = synthetic_rows(n, lines, codes, start, seed, end, years)
+    done = 0
+    while True:
+        batch = [r for _, r in zip(range(batch_size), rows)]
+        if not batch:
+            break
+        with write_conn() as conn:
+            conn.executemany(sql, batch)
+        done += len(batch)
+        if progress:
+            progress(done)
+    return done
@@ -0,0 +1,14 @@
+# tests/conftest.py — Κάθε test σε δική του, προσωρινή βάση SQLite
+import pytest
+
+from production import close_all, init_db, invalidate_cache, set_db_path
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "test.db"
+    set_db_path(path)
+    init_db()
+    invalidate_cache()
+    yield path
+    close_all()
+    invalidate_cache()
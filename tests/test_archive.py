@@ -0,0 +1,39 @@
+# tests/test_archive.py — Αρχειοθέτηση ετών: οι αναγνώσεις καλύπτουν ζωντανή βάση και αρχεία
+from datetime import date
+
+from production import (archive_year, count_rows, fetch_kpis, fetch_page, fetch_rows,
+                        invalidate_cache, metrics, synthetic)
+
+def _opened():
+    return sum(s["count"] for s in metrics.snapshot() if s["name"] == "get_ro_conn")
+
+def test_reads_span_live_and_archive(db):
+    synthetic.generate(3000, seed=2, start=date(2018, 1, 1), end=date(2019, 12, 31))
+    total = count_rows()
+    kpis = fetch_kpis(by=()).iloc[0].tolist()
+    ids = fetch_rows("2018-06-01", "2019-06-30").id.tolist()
+    assert archive_year(2018) > 0
+    invalidate_cache()
+    assert count_rows() == total
+    assert fetch_kpis(by=()).iloc[0].tolist() == kpis
+    assert fetch_rows("2018-06-01", "2019-06-30").id.tolist() == ids
+    paged, cur = [], None
+    while True:
+        df, cur = fetch_page("2018-06-01", "2019-06-30", page_size=97, after=cur)
+        paged += df.id.tolist()
+        if cur is None:
+            break
+    assert paged == ids
+
+def test_archive_connections_are_reused(db):
+    synthetic.generate(2000, seed=3, start=date(2018, 1, 1), end=date(2019, 12, 31))
+    archive_year(2018)
+    invalidate_cache()
+    count_rows()
+    before = _opened()
+    assert before > 0
+    for day in ("2018-03-01", "2018-04-01", "2018-05-01"):
+        invalidate_cache()
+        count_rows(day)
+        fetch_rows(day, "2018-06-01")
+    assert _opened() == before
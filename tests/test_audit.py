@@ -0,0 +1,31 @@
+# tests/test_audit.py — Ιστορικό αλλαγών και ανακατασκευή εγγραφής σε παλαιότερη στιγμή
+import time
+
+from production import delete_row, get_row, history, insert_row, invalidate_cache, record_at, update_row
+
+BASE = dict(rec_date="2024-05-17", line=3, group_lines=1, code="1825",
+            shift_start="06:00", shift_end="14:00")
+
+def _step():
+    time.sleep(0.01)            # τα ts του audit έχουν ακρίβεια χιλιοστού
+    invalidate_cache()
+
+def test_insert_update_delete_record_at(db):
+    id_ = insert_row(**BASE, produced_pcs=100, code_tmx1=None, red_pepper=None, l3=None, l8=4)
+    inserted = dict(get_row(id_))
+    _step()
+    update_row(id_, produced_pcs=120, l3=2)
+    updated = dict(get_row(id_))
+    _step()
+    delete_row(id_)
+    _step()
+    events = history(id_)
+    assert [e["op"] for e in events] == ["D", "U", "I"]
+    d_ts, u_ts, i_ts = (e["ts"] for e in events)
+    meta = ("version", "updated_at")
+    for ts, expected in ((u_ts, updated), (i_ts, inserted)):
+        then = record_at(id_, ts)
+        assert then == {k: v for k, v in expected.items() if k not in meta}
+    assert then["code_tmx1"] is None and then["red_pepper"] is None and then["l3"] is None
+    assert record_at(id_, d_ts) is None
+    assert record_at(id_, "2000-01-01") is None
@@ -0,0 +1,27 @@
+# tests/test_crud.py — Αποθήκευση μόνο των αλλαγμένων πεδίων (optimistic concurrency)
+from production import changed_fields, get_row, insert_row, same_value, update_row
+
+BASE = dict(rec_date="2024-05-17", line=3, group_lines=1, code="1825",
+            shift_start="06:00", shift_end="14:00")
+
+def _form(rec):
+    # όπως τα text_input της φόρμας επεξεργασίας: Κωδικός Τμχ ως κείμενο
+    return {f"code_tmx{i}": str(rec[f"code_tmx{i}"] or "").strip() or None for i in range(1, 7)}
+
+def test_noop_save_changes_nothing(db):
+    id_ = insert_row(**BASE, code_tmx1=1.5, code_tmx2=2, code_tmx3=0)
+    rec = get_row(id_)
+    assert changed_fields(rec, dict(BASE, **_form(rec))) == {}
+    assert get_row(id_)["version"] == rec["version"]
+
+def test_numeric_text_change_is_detected(db):
+    id_ = insert_row(**BASE, code_tmx1=1.5)
+    rec = get_row(id_)
+    diff = changed_fields(rec, dict(_form(rec), code_tmx1="2.5"))
+    assert diff == {"code_tmx1": "2.5"}
+    assert update_row(id_, expected_version=rec["version"], **diff) == rec["version"] + 1
+    assert get_row(id_)["code_tmx1"] == 2.5
+
+def test_same_value_matches_form_text():
+    assert same_value(1.5, "1.5") and same_value(None, "") and same_value(0, None)
+    assert not same_value(1.5, "1.50x") and not same_value("A", "B")
@@ -0,0 +1,29 @@
+# tests/test_export.py — Export σε CSV / Parquet
+import io
+
+import pytest
+
+from production import export_rows, insert_row
+
+BASE = dict(rec_date="2024-05-17", line=3, group_lines=1, code="1825",
+            shift_start="06:00", shift_end="14:00")
+
+def test_parquet_keeps_text_in_numeric_columns(db):
+    pq = pytest.importorskip("pyarrow.parquet")
+    insert_row(**BASE, code_tmx1="T-12", code_tmx2=1.5, produced_pcs=100)
+    insert_row(**BASE, code_tmx1=2.5, code_tmx2=3, produced_pcs=200)
+    buf = io.BytesIO()
+    export_rows(buf, "parquet")
+    table = pq.read_table(io.BytesIO(buf.getvalue()))
+    rows = sorted(table.to_pylist(), key=lambda r: r["id"])
+    assert str(table.schema.field("code_tmx1").type) == "string"
+    assert [r["code_tmx1"] for r in rows] == ["T-12", "2.5"]
+    assert str(table.schema.field("code_tmx2").type) == "double"
+    assert [r["code_tmx2"] for r in rows] == [1.5, 3.0]
+    assert [r["produced_pcs"] for r in rows] == [100, 200]
+
+def test_csv_keeps_text_in_numeric_columns(db):
+    insert_row(**BASE, code_tmx1="T-12")
+    buf = io.BytesIO()
+    export_rows(buf, "csv")
+    assert "T-12" in buf.getvalue().decode("utf-8")
@@ -0,0 +1,44 @@
+# tests/test_fts.py — Το ευρετήριο FTS5 πρέπει να μένει συγχρονισμένο με το production
+import random
+
+from production import delete_row, get_conn, insert_row, update_row
+from production.fts import FTS_COLUMNS, fold_text
+
+WORDS = ["σπασμένο", "μαχαίρι", "Ρύθμιση", "ζυγός", "blade", "jam", "ταινία", "αισθητήρας"]
+CODES = ["1825", "2040", "3001"]
+
+def _comment(rnd):
+    return rnd.choice([None, "", " ".join(rnd.sample(WORDS, rnd.randint(1, 3)))])
+
+def _mixed_writes(rnd, n=300):
+    # εισαγωγές, αλλαγές κωδικού/σχολίων, αλλαγές άλλων στηλών, διαγραφές
+    ids = []
+    for _ in range(n):
+        op = rnd.random()
+        if op < 0.35 or not ids:
+            ids.append(insert_row(rec_date="2024-02-01", line=rnd.randint(1, 3), group_lines=1,
+                                  code=rnd.choice(CODES), shift_start="06:00", shift_end="14:00",
+                                  l3_comment=_comment(rnd), l24_comment=_comment(rnd)))
+        elif op < 0.6:
+            update_row(rnd.choice(ids), code=rnd.choice(CODES), l3_comment=_comment(rnd),
+                       l8_comment=_comment(rnd))
+        elif op < 0.8:
+            update_row(rnd.choice(ids), produced_pcs=rnd.randint(0, 500), l25_comment=_comment(rnd))
+        else:
+            delete_row(ids.pop(rnd.randrange(len(ids))))
+
+def test_fts_in_sync_after_mixed_writes(db):
+    _mixed_writes(random.Random(0))
+    conn = get_conn()
+    try:
+        # για external content ελέγχει και ότι το ευρετήριο ταιριάζει με το view
+        conn.execute("INSERT INTO production_fts(production_fts, rank) VALUES ('integrity-check', 1);")
+        rows = conn.execute(f"SELECT id, {', '.join(FTS_COLUMNS)} FROM production;").fetchall()
+        for word in WORDS + CODES:
+            term = fold_text(word).lower()
+            hits = {r[0] for r in conn.execute("SELECT rowid FROM production_fts WHERE production_fts MATCH ?;",
+                                               (f'"{fold_text(word)}"',))}
+            expected = {r[0] for r in rows if any(term in fold_text(v).lower().split() for v in r[1:])}
+            assert hits == expected, word
+    finally:
+        conn.close()
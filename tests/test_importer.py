@@ -0,0 +1,62 @@
+# tests/test_importer.py — Μαζική εισαγωγή με upsert
+import io
+
+from production import export_rows, get_row, importer, insert_row, invalidate_cache
+
+BASE = dict(rec_date="2024-05-17", line=3, group_lines=1, code="1825",
+            shift_start="06:00", shift_end="14:00", produced_pcs=100, code_tmx1=1.5)
+
+def _csv(tmp_path):
+    buf = io.BytesIO()
+    export_rows(buf, "csv")
+    path = tmp_path / "shifts.csv"
+    path.write_bytes(buf.getvalue())
+    return path
+
+def test_reimport_unchanged_file_keeps_versions(db, tmp_path):
+    id_ = insert_row(**BASE)
+    path = _csv(tmp_path)
+    for _ in range(2):
+        res = importer.import_file(path, upsert=True)
+        assert (res["inserted"], res["updated"], res["unchanged"], res["failed"]) == (0, 0, 1, 0)
+    invalidate_cache()
+    assert get_row(id_)["version"] == 1
+
+def test_reimport_changed_row_is_updated(db, tmp_path):
+    id_ = insert_row(**BASE)
+    path = _csv(tmp_path)
+    path.write_text(path.read_text(encoding="utf-8").replace(",100,", ",120,"), encoding="utf-8")
+    res = importer.import_file(path, upsert=True)
+    assert (res["updated"], res["unchanged"]) == (1, 0)
+    invalidate_cache()
+    row = get_row(id_)
+    assert (row["produced_pcs"], row["version"]) == (120, 2)
+
+def test_unknown_columns_are_reported(db, tmp_path):
+    path = tmp_path / "shifts.csv"
+    path.write_text("Date,Line,group of lines,Κωδικός,Shift Start,Shift End,Prodused pcs\n"
+                    "2024-05-17,3,1,1825,06:00,14:00,100\n", encoding="utf-8")
+    res = importer.import_file(path)
+    assert res["ignored_columns"] == ["Prodused pcs"]
+    assert res["inserted"] == 1
+
+def test_duplicate_keys_in_file_are_reported(db, tmp_path):
+    path = tmp_path / "shifts.csv"
+    path.write_text("Date,Line,group of lines,Κωδικός,Shift Start,Shift End,produced_pcs\n"
+                    "2024-05-17,3,1,1825,06:00,14:00,100\n"
+                    "2024-05-17,3,1,1825,6:00,14:00,110\n"
+                    "2024-05-17,3,1,1825,06:00,14:00,120\n", encoding="utf-8")
+    res = importer.import_file(path, upsert=True)
+    assert (res["valid"], res["inserted"], res["duplicates"]) == (3, 1, 2)
+    assert res["errors"]["row"].tolist() == [2, 3]
+    assert res["errors"]["errors"].str.contains("γραμμή 4").all()
+
+def test_short_shift_time_matches_existing_row(db, tmp_path):
+    id_ = insert_row(**BASE)
+    path = tmp_path / "shifts.csv"
+    path.write_text("Date,Line,group of lines,Κωδικός,Shift Start,Shift End,produced_pcs\n"
+                    "2024-05-17,3,1,1825,6:00,14:00,130\n", encoding="utf-8")
+    res = importer.import_file(path, upsert=True)
+    assert (res["inserted"], res["updated"]) == (0, 1)
+    invalidate_cache()
+    assert get_row(id_)["produced_pcs"] == 130
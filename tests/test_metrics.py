@@ -0,0 +1,21 @@
+# tests/test_metrics.py — Μετρήσεις χρόνου
+import pytest
+
+from production import metrics
+
+class _Rerun(BaseException):      # όπως το RerunException/StopException του Streamlit
+    pass
+
+def _stat(name):
+    return next(r for r in metrics.snapshot() if r["kind"] == "render" and r["name"] == name)
+
+def test_control_flow_is_not_an_error():
+    metrics.reset()
+    with pytest.raises(_Rerun):
+        with metrics.timed("render", "rerun"):
+            raise _Rerun
+    with pytest.raises(ValueError):
+        with metrics.timed("render", "fail"):
+            raise ValueError
+    assert (_stat("rerun")["count"], _stat("rerun")["errors"]) == (1, 0)
+    assert (_stat("fail")["count"], _stat("fail")["errors"]) == (1, 1)
@@ -0,0 +1,24 @@
+# tests/test_plans.py — Τα βασικά queries πρέπει να πιάνουν index (βλ. production/plans.py)
+from production import check_query_plans, plans, queries, synthetic
+
+def _date_where(date_from=None, date_to=None, line=None):
+    # η μορφή πριν τη migration 1: συνάρτηση πάνω στη στήλη, χωρίς SEARCH στο index
+    q, p = queries._where(None, None, line)
+    if date_from:
+        q += " AND date(rec_date) >= date(?)"; p.append(date_from)
+    if date_to:
+        q += " AND date(rec_date) <= date(?)"; p.append(date_to)
+    return q, p
+
+def test_plans_empty_db(db):
+    assert check_query_plans() == []
+
+def test_plans_with_data(db):
+    synthetic.generate(3000, seed=1)
+    assert check_query_plans() == []
+
+def test_non_sargable_date_filter_is_caught(db, monkeypatch):
+    monkeypatch.setattr(plans, "_where", _date_where)
+    problems = check_query_plans()
+    assert any(m.startswith("date range:") for m in problems)
+    assert any("COUNT(*)" in m for m in problems)
@@ -0,0 +1,46 @@
+# tests/test_summary.py — Ο daily_summary των triggers πρέπει να ισούται με ένα GROUP BY από την αρχή
+import random
+from datetime import date
+
+import pytest
+
+from production import delete_row, get_conn, insert_row, synthetic, update_row
+from production.summary import summary_select_sql
+
+DAYS = [f"2024-02-{d:02d}" for d in range(1, 8)]
+
+def _mixed_writes(rnd, n=300):
+    # εισαγωγές, ενημερώσεις που αλλάζουν το κλειδί της σύνοψης, ενημερώσεις τιμών, διαγραφές
+    conn = get_conn()
+    ids = [r[0] for r in conn.execute("SELECT id FROM production;")]
+    conn.close()
+    for _ in range(n):
+        op = rnd.random()
+        if op < 0.3 or not ids:
+            ids.append(insert_row(rec_date=rnd.choice(DAYS), line=rnd.randint(1, 3), group_lines=1,
+                                  code=rnd.choice(["1825", "2040"]), shift_start="06:00", shift_end="14:00",
+                                  produced_pcs=rnd.randint(0, 500), red_pepper=rnd.random() * 10,
+                                  l3=rnd.choice([None, 1, 2])))
+        elif op < 0.55:
+            update_row(rnd.choice(ids), rec_date=rnd.choice(DAYS), line=rnd.randint(1, 3),
+                       code=rnd.choice(["1825", "2040", "3001"]))
+        elif op < 0.8:
+            update_row(rnd.choice(ids), produced_pcs=rnd.choice([None, rnd.randint(0, 500)]),
+                       red_pepper=rnd.random() * 10)
+        else:
+            delete_row(ids.pop(rnd.randrange(len(ids))))
+
+def _rows(conn, sql):
+    return conn.execute(sql + " ORDER BY rec_date, line, code").fetchall()
+
+def test_summary_matches_full_rebuild(db):
+    synthetic.generate(200, seed=3, start=date(2024, 1, 1), end=date(2024, 3, 31))
+    _mixed_writes(random.Random(0))
+    conn = get_conn()
+    try:
+        actual = _rows(conn, "SELECT * FROM daily_summary")
+        expected = _rows(conn, summary_select_sql())
+    finally:
+        conn.close()
+    assert [r[:4] for r in actual] == [r[:4] for r in expected]
+    assert [r[4:] for r in actual] == [pytest.approx(r[4:]) for r in expected]